@@ -0,0 +1,125 @@
+"""
+Async Rendering - asyncio entry points for services that embed the generator
+
+Parsing and rendering run in an executor: the loop's default thread pool
+unless a concurrent.futures.ProcessPoolExecutor (or any other executor) is
+passed in for CPU-bound workloads. Input, output and stylesheet reads never
+block the event loop.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Tuple, Union
+
+from main import read_input, render_markdown, write_output
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def render_async(
+    markdown: str,
+    css_file_path: str = "style.css",
+    executor: Optional[Executor] = None,
+) -> str:
+    """Renders a Markdown resume to HTML without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    # render_markdown is module-level, so process pools can pickle it
+    return await loop.run_in_executor(
+        executor, render_markdown, markdown, css_file_path
+    )
+
+
+async def render_file_async(
+    input_path,
+    output_path=None,
+    css_file_path: str = "style.css",
+    executor: Optional[Executor] = None,
+) -> Path:
+    """Async counterpart of main.render_file for HTML output; returns output_path."""
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path else input_path.with_suffix(".html")
+    loop = asyncio.get_running_loop()
+    # File I/O always goes to the default thread pool, even with a process executor
+    markdown, _ = await loop.run_in_executor(None, read_input, input_path)
+    html = await render_async(markdown, css_file_path, executor)
+    await loop.run_in_executor(None, write_output, output_path, html)
+    return output_path
+
+
+async def _aiter(documents: Union[AsyncIterable[str], Iterable[str]]):
+    if hasattr(documents, "__aiter__"):
+        async for markdown in documents:
+            yield markdown
+    else:
+        for markdown in documents:
+            yield markdown
+
+
+async def render_many(
+    documents: Union[AsyncIterable[str], Iterable[str]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+    css_file_path: str = "style.css",
+    executor: Optional[Executor] = None,
+    return_exceptions: bool = False,
+) -> AsyncIterator[Tuple[int, Union[str, BaseException]]]:
+    """
+    Renders Markdown documents from a (possibly async) iterable and yields
+    (index, html) pairs, index being the document's position in the input.
+
+    At most `concurrency` documents are in flight or waiting to be yielded, so
+    the source is only consumed as fast as results are taken. With ordered,
+    results come back in input order; otherwise as they complete. A failed
+    render raises (cancelling the rest) unless return_exceptions is set, in
+    which case the exception is yielded in place of the HTML.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    source = _aiter(documents)
+    indexes = {}
+    submitted = 0
+    pending = set()
+    finished = {}
+    next_index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) + len(finished) < concurrency:
+                try:
+                    markdown = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(
+                    render_async(markdown, css_file_path, executor)
+                )
+                indexes[task] = submitted
+                submitted += 1
+                pending.add(task)
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in sorted(done, key=indexes.get):
+                index = indexes.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    result = e
+                if ordered:
+                    finished[index] = result
+                else:
+                    yield index, result
+            while next_index in finished:
+                yield next_index, finished.pop(next_index)
+                next_index += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        await source.aclose()
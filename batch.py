@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Batch Renderer - Render many Markdown resumes in a worker process pool
+Usage: python batch.py resumes/*.md --out-dir out/ [--format pdf] [--jobs N]
+                       [--journal job.jsonl] [--timeout SECONDS]
+                       [--io-threads N] [--prefetch N] [--fsync-batch N]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from main import OUTPUT_FORMATS, render_markdown, write_output
+from metrics import MetricsLog
+from store import LINK_MODES, OutputStore
+
+DEFAULT_IO_THREADS = 8
+# Worker pools start after the I/O threads (and again after a pool breaks),
+# and forking a process that runs threads can deadlock the child
+WORKER_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# Times a file whose worker pool broke is rendered again, alone in its own pool
+RENDER_RETRIES = 1
+
+
+class RenderTimeout(Exception):
+    pass
+
+
+def output_path_for(input_path: Path, out_dir: Path, output_format: str) -> Path:
+    return out_dir / input_path.with_suffix(f".{output_format}").name
+
+
+def options_fingerprint(
+    style: str, output_format: str, store: Optional[OutputStore] = None
+) -> str:
+    """
+    Hash of the options that change what a file renders to: the stylesheet's
+    path and content, the format, and the store and link mode outputs go to.
+    """
+    try:
+        with open(style, "rb") as f:
+            css_digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        css_digest = None  # rendered with the fallback style
+    options = {
+        "style": os.path.abspath(style),
+        "style_sha256": css_digest,
+        "format": output_format,
+        "store": os.path.abspath(store.root) if store else None,
+        "link": store.link_mode if store else None,
+    }
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()
+
+
+class Journal:
+    """
+    Append-only JSON-lines record of finished inputs, their content hashes
+    and the options they were rendered with. A restarted batch skips inputs
+    whose hash, options and output still match an "ok" entry; failed inputs
+    are retried. A torn last line (from a crash in the
+    middle of a write) is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.completed: Dict[str, Tuple[str, str, Optional[str]]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("status") == "ok":
+                        self.completed[entry["input"]] = (
+                            entry["sha256"],
+                            entry["output"],
+                            entry.get("options"),
+                        )
+                    else:
+                        self.completed.pop(entry.get("input"), None)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell():
+            # Terminate a torn last line so the next entry starts cleanly
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def known_digest(
+        self, input_path: Path, output_path: Path, options: str
+    ) -> Optional[str]:
+        """
+        The journaled hash for input_path if it was rendered to output_path
+        with the same options fingerprint.
+        """
+        entry = self.completed.get(str(input_path))
+        if entry and entry[1:] == (str(output_path), options):
+            return entry[0]
+        return None
+
+    def record(
+        self,
+        input_path: Path,
+        output_path: Path,
+        digest: Optional[str],
+        error: Optional[str],
+        options: Optional[str] = None,
+    ):
+        entry = {
+            "input": str(input_path),
+            "output": str(output_path),
+            "sha256": digest,
+            "options": options,
+            "status": "failed" if error else "ok",
+        }
+        if error:
+            entry["error"] = error
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _raise_timeout(signum, frame):
+    raise RenderTimeout()
+
+
+def _read_input(
+    input_path: Path, output_path: Path, known_digest: Optional[str]
+) -> Dict:
+    """
+    Read stage (I/O thread). Returns the input's digest and, unless the
+    journal shows it as already rendered to an existing output, its text.
+    """
+    started = time.perf_counter()
+    with open(input_path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest == known_digest and output_path.exists():
+        return {"digest": digest, "skipped": True}
+    # Decode exactly like main.read_input (universal newlines)
+    markdown = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").read()
+    return {
+        "digest": digest,
+        "skipped": False,
+        "markdown": markdown,
+        "metrics": {
+            "input_bytes": len(data),
+            "read_s": time.perf_counter() - started,
+        },
+    }
+
+
+def _render_one(
+    markdown: str,
+    style: str,
+    output_format: str,
+    timeout: Optional[float] = None,
+) -> Dict:
+    """
+    Render stage (worker process). Returns a dict with the rendered output,
+    the error message (None on success) and metrics.
+    """
+    result = {"output": None, "error": None, "metrics": {}}
+    # setitimer is POSIX-only; elsewhere the timeout is not enforced
+    use_timer = bool(timeout) and hasattr(signal, "setitimer")
+    try:
+        if use_timer:
+            signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            result["output"] = render_markdown(
+                markdown, style, output_format, result["metrics"]
+            )
+        finally:
+            if use_timer:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except RenderTimeout:
+        result["error"] = f"Timed out after {timeout:g}s"
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _write_one(output_path: Path, output, store: Optional[OutputStore]) -> Dict:
+    """Write stage (I/O thread)."""
+    started = time.perf_counter()
+    metrics = {}
+    if store:
+        metrics["output_bytes"], metrics["deduplicated"] = store.write(
+            output_path, output
+        )
+    else:
+        metrics["output_bytes"] = write_output(output_path, output)
+    metrics["write_s"] = time.perf_counter() - started
+    return metrics
+
+
+def _sync_outputs(output_paths: List[Path]):
+    """Fsyncs a group of written files, then each of their directories once."""
+    for path in output_paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    if os.name == "posix":  # directories can only be opened for fsync on POSIX
+        for directory in {path.parent for path in output_paths}:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+def render_batch(
+    input_paths: Iterable[Path],
+    out_dir: Path,
+    style: str = "style.css",
+    output_format: str = "html",
+    jobs: Optional[int] = None,
+    metrics_log: Optional[MetricsLog] = None,
+    journal: Optional[Journal] = None,
+    timeout: Optional[float] = None,
+    io_threads: int = DEFAULT_IO_THREADS,
+    prefetch: Optional[int] = None,
+    fsync_batch: Optional[int] = None,
+    store: Optional[OutputStore] = None,
+) -> List[Tuple[Path, Optional[str], bool]]:
+    """
+    Renders every input into out_dir through three overlapping stages: a
+    thread pool reads inputs, a pool of worker processes renders them and
+    the thread pool writes the outputs. At most `prefetch` files (default:
+    four per worker) are between reading and writing at any time, which
+    bounds memory while keeping the workers fed during slow reads and writes.
+
+    With fsync_batch, outputs are fsynced in groups of that many files and
+    only journaled once durable. If a worker process dies, the rest continue
+    in a new pool, and the files that were in flight on the broken one are
+    retried one at a time in a single-worker pool: only a file that kills
+    the worker there too fails. With store, outputs are links into that
+    content-addressed store. The timeout applies to rendering only.
+
+    Outputs are named after the input's file name, so an input whose output
+    name an earlier input already took fails instead of overwriting it.
+
+    Returns (input_path, error, skipped) in completion order; error is None on
+    success and skipped is True for inputs the journal shows as already done.
+    Only this process writes to metrics_log and the journal.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    prefetch = prefetch or 4 * jobs
+    inputs = iter(input_paths)
+    events = queue.Queue()
+    results = []
+    unsynced = []
+    claimed: Dict[Path, Path] = {}
+    in_flight = 0
+    syncing = 0
+    exhausted = False
+    options = options_fingerprint(style, output_format, store) if journal else None
+    # Files whose pool broke, waiting to be retried alone
+    suspects = deque()
+    retrying = None
+
+    def finish(job: Dict):
+        error = job["error"]
+        if not job["skipped"]:
+            if journal:
+                journal.record(
+                    job["input"], job["output"], job["digest"], error, options
+                )
+            if metrics_log and error:
+                metrics_log.record_failure(job["input"], error)
+            elif metrics_log:
+                metrics_log.record(job["metrics"])
+        results.append((job["input"], error, job["skipped"]))
+
+    io_pool = ThreadPoolExecutor(io_threads)
+    workers = {"render": jobs, "retry": 1}
+    render_pools = {
+        name: ProcessPoolExecutor(count, mp_context=WORKER_CONTEXT)
+        for name, count in workers.items()
+    }
+    try:
+
+        def submit(stage, pool, function, job, *args):
+            future = pool.submit(function, *args)
+            future.add_done_callback(lambda done: events.put((stage, job, done)))
+
+        def submit_render(job, pool_name="render"):
+            args = (job, job["markdown"], style, output_format, timeout)
+            try:
+                submit("render", render_pools[pool_name], _render_one, *args)
+            except BrokenProcessPool:
+                # A worker died (segfault, OOM kill) and took the pool down;
+                # the files it had in flight come back to be retried
+                render_pools[pool_name].shutdown()
+                render_pools[pool_name] = ProcessPoolExecutor(
+                    workers[pool_name], mp_context=WORKER_CONTEXT
+                )
+                submit("render", render_pools[pool_name], _render_one, *args)
+
+        while True:
+            while not exhausted and in_flight < prefetch:
+                try:
+                    input_path = next(inputs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                output_path = output_path_for(input_path, out_dir, output_format)
+                job = {
+                    "input": input_path,
+                    "output": output_path,
+                    "digest": None,
+                    "skipped": False,
+                    "error": None,
+                    "retries": 0,
+                    "metrics": {
+                        "input": str(input_path),
+                        "output": str(output_path),
+                        "format": output_format,
+                    },
+                }
+                if output_path in claimed:
+                    # Same file name from another directory: never overwrite
+                    job["error"] = (
+                        f"Output '{output_path}' is already taken by "
+                        f"'{claimed[output_path]}'"
+                    )
+                    finish(job)
+                    continue
+                claimed[output_path] = input_path
+                known_digest = (
+                    journal.known_digest(input_path, output_path, options)
+                    if journal
+                    else None
+                )
+                submit(
+                    "read",
+                    io_pool,
+                    _read_input,
+                    job,
+                    input_path,
+                    output_path,
+                    known_digest,
+                )
+                in_flight += 1
+            if unsynced and (
+                len(unsynced) >= fsync_batch or (exhausted and not in_flight)
+            ):
+                group, unsynced = unsynced, []
+                submit(
+                    "sync",
+                    io_pool,
+                    _sync_outputs,
+                    group,
+                    [job["output"] for job in group],
+                )
+                syncing += 1
+            if suspects and retrying is None:
+                retrying = suspects.popleft()
+                submit_render(retrying, "retry")
+            if not in_flight and not syncing:
+                break
+
+            stage, job, future = events.get()
+            if job is retrying:
+                retrying = None
+            try:
+                value = future.result()
+            except BrokenProcessPool:
+                if job["retries"] < RENDER_RETRIES:
+                    # The worker that died may have been rendering another
+                    # file; retrying this one alone tells them apart
+                    job["retries"] += 1
+                    suspects.append(job)
+                    continue
+                value = {"error": "A worker process died while rendering this file"}
+            except Exception as e:
+                value = {"error": str(e)}
+
+            if stage == "sync":
+                syncing -= 1
+                for synced_job in job:
+                    if value:
+                        synced_job["error"] = f"fsync failed: {value['error']}"
+                    finish(synced_job)
+                continue
+
+            if stage == "render":
+                del job["markdown"]
+            job["metrics"].update(value.pop("metrics", {}))
+            if stage == "read" and not value.get("error"):
+                job["digest"] = value["digest"]
+                job["skipped"] = value["skipped"]
+                if not job["skipped"]:
+                    # Kept until rendered, in case the file has to be retried
+                    job["markdown"] = value["markdown"]
+                    submit_render(job)
+                    continue
+            elif stage == "render" and not value["error"]:
+                submit(
+                    "write",
+                    io_pool,
+                    _write_one,
+                    job,
+                    job["output"],
+                    value["output"],
+                    store,
+                )
+                continue
+            elif stage == "write" and not value.get("error"):
+                job["metrics"].update(value)
+
+            # The job is done with (or failed in) its last stage
+            in_flight -= 1
+            job["error"] = value.get("error")
+            if fsync_batch and not job["error"] and not job["skipped"]:
+                unsynced.append(job)
+            else:
+                finish(job)
+    finally:
+        for render_pool in render_pools.values():
+            render_pool.shutdown()
+        io_pool.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render many Markdown resumes in parallel"
+    )
+    parser.add_argument("input_files", nargs="+", help="Input markdown files")
+    parser.add_argument(
+        "--out-dir", "-o", required=True, help="Directory for the rendered files"
+    )
+    parser.add_argument(
+        "--style",
+        "-s",
+        default="style.css",
+        help="Path to custom CSS file (default: style.css)",
+    )
+    parser.add_argument(
+        "--format",
+        "-f",
+        choices=OUTPUT_FORMATS,
+        default="html",
+        help="Output format (default: html)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--io-threads",
+        type=int,
+        default=DEFAULT_IO_THREADS,
+        help=f"Threads reading inputs and writing outputs (default: {DEFAULT_IO_THREADS})",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        metavar="N",
+        help="Most files read but not yet written at once (default: 4 per job)",
+    )
+    parser.add_argument(
+        "--fsync-batch",
+        type=int,
+        metavar="N",
+        help="Fsync outputs in groups of N and journal them only once durable",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Append per-file and summary JSON lines with run metrics to PATH",
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="PATH",
+        help="Job journal; a rerun with the same journal skips finished, unchanged inputs",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="Keep outputs in a content-addressed store and link them into place",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="hardlink",
+        help="How --store links outputs into place (default: hardlink)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Fail any single file that takes longer than this to render",
+    )
+    args = parser.parse_args()
+
+    metrics_log = MetricsLog(args.metrics) if args.metrics else None
+    journal = Journal(args.journal) if args.journal else None
+    store = OutputStore(args.store, args.link) if args.store else None
+    try:
+        results = render_batch(
+            [Path(name) for name in args.input_files],
+            Path(args.out_dir),
+            args.style,
+            args.format,
+            args.jobs,
+            metrics_log,
+            journal,
+            args.timeout,
+            args.io_threads,
+            args.prefetch,
+            args.fsync_batch,
+            store,
+        )
+    finally:
+        if metrics_log:
+            metrics_log.close()
+        if journal:
+            journal.close()
+        if store:
+            store.close()
+    failures = [(path, error) for path, error, _ in results if error]
+    skipped = sum(1 for _, _, was_skipped in results if was_skipped)
+    for path, error in failures:
+        print(f"Error generating resume '{path}': {error}", file=sys.stderr)
+    print(
+        f"Generated {len(results) - len(failures) - skipped} of {len(results)} resumes"
+        + (f" ({skipped} already done)" if skipped else "")
+    )
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Differential fuzzer - render random resumes through main.py and reference.py
+Usage: python fuzz.py [--seed N] [--iterations N] [--bench]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import main
+import reference
+
+WORDS = [
+    "Python",
+    "Go",
+    "Kubernetes",
+    "lead",
+    "built",
+    "team",
+    "snake_case_name",
+    "x_y",
+    "C++",
+    "Wrocław",
+    "2019",
+    "-",
+    "|",
+    "(remote)",
+    "a*b",
+    "__init__",
+    "***",
+    ":",
+    "R&D",
+    "<script>",
+    '"quoted"',
+    "it's",
+    "&amp;",
+]
+
+URLS = [
+    "https://example.com",
+    "http://example.com/foo_bar/doc_v1.html",
+    "https://example.com/?a=1&b=2",
+    "mailto:someone@example.com",
+    'https://example.com/"onmouseover="x',
+    "javascript:alert(1)",
+    " JavaScript:alert(1)",
+    "java\tscript:alert(1)",
+    "data:text/html,<b>",
+]
+
+
+class ResumeGrammar:
+    """Seeded generator of random (and often malformed) resume Markdown."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def word(self) -> str:
+        return self.rng.choice(WORDS)
+
+    def inline(self, max_tokens: int = 8) -> str:
+        tokens = []
+        for _ in range(self.rng.randint(1, max_tokens)):
+            roll = self.rng.random()
+            if roll < 0.55:
+                tokens.append(self.word())
+            elif roll < 0.68:
+                tokens.append(f"**{self.word()} {self.word()}**")
+            elif roll < 0.8:
+                tokens.append(f"_{self.word()}_")
+            elif roll < 0.92:
+                tokens.append(f"[{self.inline(2)}]({self.rng.choice(URLS)})")
+            else:
+                tokens.append(self.rng.choice(["**", "_", "[", "](", ")", "*"]))
+        return " ".join(tokens)
+
+    def content_line(self) -> str:
+        roll = self.rng.random()
+        indent = self.rng.choice(["", "", "", "  ", "\t"])
+        if roll < 0.25:
+            line = f"- {self.inline()}"
+        elif roll < 0.4:
+            line = f"**{self.inline(2)}:** {self.inline()}"
+        elif roll < 0.55:
+            line = f"**{self.inline(2)}** - {self.inline()}"
+        elif roll < 0.65:
+            line = f"### {self.inline(3)} | {self.inline(3)}"
+        elif roll < 0.72:
+            line = f"_{self.inline(3)}_"
+        elif roll < 0.78:
+            line = f"-{self.inline(2)}"
+        elif roll < 0.82:
+            line = f"# {self.inline(2)}"
+        elif roll < 0.85:
+            line = f"**{self.word()}** | {self.inline(2)}"
+        else:
+            line = self.inline()
+        return indent + line
+
+    def section(self) -> List[str]:
+        lines = [f"## {self.inline(3)}"]
+        for _ in range(self.rng.randint(0, 8)):
+            if self.rng.random() < 0.15:
+                lines.append("")
+            lines.append(self.content_line())
+        return lines
+
+    def resume(self) -> str:
+        lines = []
+        if self.rng.random() < 0.9:
+            lines.append(f"# {self.inline(3)}")
+        if self.rng.random() < 0.8:
+            title = f"**{self.word()} {self.word()}**"
+            if self.rng.random() < 0.5:
+                title += f" | {self.inline(3)}"
+            lines.append(title)
+        for _ in range(self.rng.randint(0, 3)):
+            lines.append(self.inline())
+        for _ in range(self.rng.randint(0, 6)):
+            lines.append("")
+            lines.extend(self.section())
+        return "\n".join(lines) + self.rng.choice(["", "\n", "\n\n"])
+
+
+Engine = Tuple[Callable, Callable]
+
+ENGINES: Dict[str, Engine] = {
+    "reference": (reference.ResumeParser, reference.HTMLGenerator),
+    "main": (main.ResumeParser, main.HTMLGenerator),
+}
+
+
+def render(engine: Engine, markdown: str) -> Tuple[Dict, str]:
+    """Parse and render markdown with the given (parser, generator) pair."""
+    parser_cls, generator_cls = engine
+    parsed_data = parser_cls().parse_markdown(markdown)
+    # os.devnull reads as an empty stylesheet, so no warnings and no disk I/O
+    html = generator_cls(css_file_path=os.devnull).generate_html(parsed_data)
+    return parsed_data, html
+
+
+def diverges(markdown: str, candidate: Engine, baseline: Engine) -> bool:
+    try:
+        expected = render(baseline, markdown)
+    except Exception as e:
+        expected = ("error", repr(e))
+    try:
+        actual = render(candidate, markdown)
+    except Exception as e:
+        actual = ("error", repr(e))
+    return actual != expected
+
+
+def _ddmin(items: List[str], still_fails: Callable[[List[str]], bool]) -> List[str]:
+    """Classic delta debugging: shrink items while still_fails holds."""
+    chunks = 2
+    while len(items) >= 2:
+        size = max(1, len(items) // chunks)
+        reduced = False
+        for start in range(0, len(items), size):
+            complement = items[:start] + items[start + size :]
+            if complement and still_fails(complement):
+                items = complement
+                chunks = max(chunks - 1, 2)
+                reduced = True
+                break
+        if not reduced:
+            if chunks >= len(items):
+                break
+            chunks = min(len(items), chunks * 2)
+    return items
+
+
+def minimize(markdown: str, still_fails: Callable[[str], bool]) -> str:
+    """Reduce a failing document to a small one that still fails."""
+    lines = _ddmin(
+        markdown.split("\n"), lambda candidate: still_fails("\n".join(candidate))
+    )
+    for i in range(len(lines)):
+
+        def line_fails(tokens: List[str], i=i) -> bool:
+            return still_fails("\n".join(lines[:i] + [" ".join(tokens)] + lines[i + 1 :]))
+
+        lines[i] = " ".join(_ddmin(lines[i].split(" "), line_fails))
+    return "\n".join(lines)
+
+
+def fuzz(
+    seed: int,
+    iterations: int,
+    candidate: Engine = ENGINES["main"],
+    baseline: Engine = ENGINES["reference"],
+) -> Optional[Tuple[int, str]]:
+    """Returns (seed, minimized markdown) of the first divergence, or None."""
+    for offset in range(iterations):
+        markdown = ResumeGrammar(seed + offset).resume()
+        if diverges(markdown, candidate, baseline):
+            minimized = minimize(
+                markdown, lambda md: diverges(md, candidate, baseline)
+            )
+            return seed + offset, minimized
+    return None
+
+
+def throughput(engine: Engine, documents: List[str], rounds: int = 3) -> float:
+    """Best-of-rounds documents per second for parse + render."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for markdown in documents:
+            render(engine, markdown)
+        best = min(best, time.perf_counter() - start)
+    return len(documents) / best if best else float("inf")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(
+        description="Differential fuzzing of main.py against reference.py"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="First seed (default: 0)")
+    parser.add_argument(
+        "--iterations",
+        "-n",
+        type=int,
+        default=1000,
+        help="Number of random resumes to try (default: 1000)",
+    )
+    parser.add_argument(
+        "--bench", action="store_true", help="Also report relative throughput"
+    )
+    args = parser.parse_args()
+
+    failure = fuzz(args.seed, args.iterations)
+    if failure:
+        failing_seed, minimized = failure
+        print(f"Divergence found (seed {failing_seed}). Minimized input:")
+        print(minimized)
+        sys.exit(1)
+    print(f"No divergence in {args.iterations} resumes (seeds {args.seed}..)")
+
+    if args.bench:
+        documents = [
+            ResumeGrammar(args.seed + offset).resume()
+            for offset in range(args.iterations)
+        ]
+        reference_rate = throughput(ENGINES["reference"], documents)
+        main_rate = throughput(ENGINES["main"], documents)
+        print(f"reference: {reference_rate:,.0f} docs/s")
+        print(f"main:      {main_rate:,.0f} docs/s ({main_rate / reference_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main_cli()
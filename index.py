@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Corpus Index - Inverted index of skills, terms, companies and roles
+Usage: python index.py build corpus_dir index_dir
+       python index.py query index_dir 'kubernetes AND (role:cto OR role:"tech lead")'
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import shutil
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from main import DESCRIPTION_LIST_RE, LINK_RE, HTMLGenerator, ResumeParser
+
+FIELDS = ("skill", "category", "term", "company", "role")
+
+# Each build writes a fresh generation directory; CURRENT names the live one
+CURRENT_FILE = "CURRENT"
+GENERATION_PREFIX = "gen-"
+MANIFEST_FILE = "manifest.json"
+LEXICON_FILE = "lexicon.json"
+POSTINGS_FILE = "postings.bin"
+PATHS_FILE = "paths.json"
+
+# Postings are little-endian uint32 doc ids, sorted ascending
+POSTING_TYPECODE = "I"
+
+QUERY_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|((?:\w+:)?"[^"]*")|([^\s()]+))')
+
+
+def normalize(text: str) -> str:
+    """Reduces inline markdown to a lowercase, whitespace-collapsed term."""
+    text = LINK_RE.sub(r"\1", text)
+    text = re.sub(r"\([^)]*\)", "", text)
+    text = text.replace("**", "").strip(" _*.;:")
+    return " ".join(text.lower().split())
+
+
+def extract_terms(parsed_data: Dict) -> Set[str]:
+    """Returns the set of field:term keys for a parsed resume."""
+    generator = HTMLGenerator()
+    terms = set()
+
+    def add(field, text):
+        term = normalize(text)
+        if term:
+            terms.add(f"{field}:{term}")
+
+    for section in parsed_data["sections"]:
+        content = section["content"]
+        if section["type"] == "aligned_list":
+            for category, skill_list in generator.parse_technical_expertise(content):
+                add("category", category)
+                for skill in re.split(r"[,;]", skill_list):
+                    add("skill", skill)
+        elif section["type"] == "description_list":
+            for line in content.split("\n"):
+                match = DESCRIPTION_LIST_RE.match(line.strip())
+                if match:
+                    add("term", match.group(1))
+        elif section["type"] == "timeline":
+            for entry in content.split("###"):
+                job_data = generator.parse_experience_entry(entry)
+                if job_data:
+                    add("company", job_data["company"])
+                    add("role", job_data["role"])
+    return terms
+
+
+class CorpusIndex:
+    """
+    On-disk inverted index over a directory of Markdown resumes.
+
+    The manifest remembers each document's size, mtime and extracted terms,
+    so an update only re-parses files that changed; it is read by build
+    only. Postings live in one flat file that is memory-mapped on query;
+    only the lexicon (term -> offset, count) and the doc id -> path list are
+    loaded into memory.
+
+    Every build writes a new generation directory and then atomically
+    replaces CURRENT to point at it, so a crash at any point leaves the
+    previous index intact and readers never see a mix of two builds.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = Path(index_dir)
+        self._lexicon: Optional[Dict[str, List[int]]] = None
+        self._postings_file = None
+        self._postings: Optional[memoryview] = None
+        self._paths: Optional[List[str]] = None
+
+    def _generation(self) -> Path:
+        """The live generation directory; FileNotFoundError if never built."""
+        with open(self.index_dir / CURRENT_FILE, "r", encoding="utf-8") as f:
+            return self.index_dir / f.read().strip()
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self._generation() / MANIFEST_FILE, "r", encoding="utf-8") as f:
+                return {doc["path"]: doc for doc in json.load(f)["docs"]}
+        except FileNotFoundError:
+            return {}
+
+    def build(self, corpus_dir, pattern: str = "*.md") -> Dict[str, int]:
+        """
+        Indexes (or incrementally re-indexes) every file matching pattern.
+        Files that cannot be read or are not UTF-8 are reported on stderr,
+        counted as failed and left out of the index.
+        """
+        self.close()
+        previous = self._load_manifest()
+        docs = []
+        stats = {"parsed": 0, "reused": 0, "removed": 0, "failed": 0}
+
+        for path in sorted(Path(corpus_dir).rglob(pattern)):
+            key = str(path)
+            cached = previous.pop(key, None)
+            try:
+                stat = path.stat()
+                if (
+                    cached
+                    and cached["mtime_ns"] == stat.st_mtime_ns
+                    and cached["size"] == stat.st_size
+                ):
+                    docs.append(cached)
+                    stats["reused"] += 1
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    markdown_content = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error indexing '{path}': {e}", file=sys.stderr)
+                stats["failed"] += 1
+                continue
+            parsed_data = ResumeParser().parse_markdown(markdown_content)
+            docs.append(
+                {
+                    "path": key,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "terms": sorted(extract_terms(parsed_data)),
+                }
+            )
+            stats["parsed"] += 1
+        stats["removed"] = len(previous)
+
+        self._write(docs)
+        return stats
+
+    def _write(self, docs: List[Dict]):
+        postings: Dict[str, array] = {}
+        for doc_id, doc in enumerate(docs):
+            for term in doc["terms"]:
+                postings.setdefault(term, array(POSTING_TYPECODE)).append(doc_id)
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        generations = sorted(
+            int(path.name[len(GENERATION_PREFIX) :])
+            for path in self.index_dir.glob(GENERATION_PREFIX + "*")
+        )
+        name = f"{GENERATION_PREFIX}{(generations[-1] + 1) if generations else 1}"
+        generation = self.index_dir / name
+        generation.mkdir()
+
+        lexicon = {}
+        offset = 0
+        with open(generation / POSTINGS_FILE, "wb") as f:
+            for term in sorted(postings):
+                ids = postings[term]
+                if sys.byteorder != "little":
+                    ids.byteswap()
+                f.write(ids.tobytes())
+                lexicon[term] = [offset, len(ids)]
+                offset += len(ids)
+            f.flush()
+            os.fsync(f.fileno())
+        self._write_json(generation / LEXICON_FILE, lexicon)
+        self._write_json(generation / PATHS_FILE, [doc["path"] for doc in docs])
+        self._write_json(generation / MANIFEST_FILE, {"docs": docs})
+
+        # The single switch from the old generation to the new one
+        tmp_current = self.index_dir / (CURRENT_FILE + ".tmp")
+        with open(tmp_current, "w", encoding="utf-8") as f:
+            f.write(name)
+            f.flush()
+            os.fsync(f.fileno())
+        previous = (
+            self._generation() if (self.index_dir / CURRENT_FILE).exists() else None
+        )
+        os.replace(tmp_current, self.index_dir / CURRENT_FILE)
+
+        # Keep the previous generation for readers that opened it just now;
+        # anything older (or left by a crashed build) is garbage
+        for path in self.index_dir.glob(GENERATION_PREFIX + "*"):
+            if path not in (generation, previous):
+                shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _write_json(path: Path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _open(self):
+        if self._lexicon is not None:
+            return
+        generation = self._generation()
+        with open(generation / LEXICON_FILE, "r", encoding="utf-8") as f:
+            self._lexicon = json.load(f)
+        with open(generation / PATHS_FILE, "r", encoding="utf-8") as f:
+            self._paths = json.load(f)
+        self._postings_file = open(generation / POSTINGS_FILE, "rb")
+        if os.fstat(self._postings_file.fileno()).st_size:
+            mapped = mmap.mmap(self._postings_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._postings = memoryview(mapped).cast(POSTING_TYPECODE)
+        else:
+            self._postings = memoryview(array(POSTING_TYPECODE))
+
+    def close(self):
+        if self._postings is not None:
+            obj = self._postings.obj
+            self._postings.release()
+            if isinstance(obj, mmap.mmap):
+                obj.close()
+        if self._postings_file is not None:
+            self._postings_file.close()
+        self._lexicon = self._postings = self._postings_file = self._paths = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def postings(self, term: str) -> Set[int]:
+        """Doc ids for 'field:value', or for value in any field."""
+        self._open()
+        field, sep, value = term.partition(":")
+        if sep and field in FIELDS:
+            keys = [f"{field}:{normalize(value)}"]
+        else:
+            keys = [f"{field}:{normalize(term)}" for field in FIELDS]
+        doc_ids = set()
+        for key in keys:
+            entry = self._lexicon.get(key)
+            if entry:
+                offset, count = entry
+                ids = self._postings[offset : offset + count]
+                if sys.byteorder != "little":
+                    ids = array(POSTING_TYPECODE, ids)
+                    ids.byteswap()
+                doc_ids.update(ids)
+        return doc_ids
+
+    def query(self, expression: str) -> List[str]:
+        """
+        Evaluates a boolean query and returns matching paths.
+        Supports AND, OR, NOT, parentheses, field:value and "quoted phrases";
+        adjacent terms are ANDed.
+        """
+        self._open()
+        doc_ids = _QueryParser(expression, self).parse()
+        return [self._paths[doc_id] for doc_id in sorted(doc_ids)]
+
+    def all_docs(self) -> Set[int]:
+        self._open()
+        return set(range(len(self._paths)))
+
+
+class _QueryParser:
+    """Recursive descent: or_expr := and_expr (OR and_expr)*, and so on."""
+
+    def __init__(self, expression: str, index: CorpusIndex):
+        self.tokens = list(self._tokenize(expression))
+        self.pos = 0
+        self.index = index
+
+    @staticmethod
+    def _tokenize(expression: str) -> Iterator[str]:
+        for match in QUERY_TOKEN_RE.finditer(expression.strip()):
+            token = next(group for group in match.groups() if group is not None)
+            yield token.replace('"', "")
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Unexpected end of query")
+        self.pos += 1
+        return token
+
+    def parse(self) -> Set[int]:
+        if not self.tokens:
+            return set()
+        result = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()}' in query")
+        return result
+
+    def _or(self) -> Set[int]:
+        result = self._and()
+        while self._peek() == "OR":
+            self._take()
+            result = result | self._and()
+        return result
+
+    def _and(self) -> Set[int]:
+        result = self._not()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._take()
+            result = result & self._not()
+        return result
+
+    def _not(self) -> Set[int]:
+        if self._peek() == "NOT":
+            self._take()
+            return self.index.all_docs() - self._not()
+        return self._atom()
+
+    def _atom(self) -> Set[int]:
+        token = self._take()
+        if token == "(":
+            result = self._or()
+            if self._take() != ")":
+                raise ValueError("Missing ')' in query")
+            return result
+        if token in ("AND", "OR", ")"):
+            raise ValueError(f"Unexpected '{token}' in query")
+        return self.index.postings(token)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and query an inverted index over Markdown resumes"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser(
+        "build", help="Index a directory (incremental if the index exists)"
+    )
+    build_parser.add_argument("corpus_dir", help="Directory of markdown resumes")
+    build_parser.add_argument("index_dir", help="Index directory")
+    build_parser.add_argument(
+        "--pattern", default="*.md", help="Glob of files to index (default: *.md)"
+    )
+    query_parser = subparsers.add_parser("query", help="Run a boolean query")
+    query_parser.add_argument("index_dir", help="Index directory")
+    query_parser.add_argument("expression", help="Query, e.g. 'kubernetes AND go'")
+    args = parser.parse_args()
+
+    try:
+        with CorpusIndex(args.index_dir) as index:
+            if args.command == "build":
+                stats = index.build(args.corpus_dir, args.pattern)
+                print(
+                    f"Indexed {stats['parsed']} new or changed, "
+                    f"reused {stats['reused']}, removed {stats['removed']}"
+                    + (f", failed {stats['failed']}" if stats["failed"] else "")
+                )
+                if stats["failed"]:
+                    sys.exit(1)
+            else:
+                for path in index.query(args.expression):
+                    print(path)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Large Documents - Stream sections with thousands of entries in bounded chunks
+
+Big sections are never built up as one string: their entries are rendered one
+at a time and flushed to the output file every chunk_size entries, so output
+memory does not grow with the number of entries. With split pages, each big
+section moves to its own paginated files and the main page links to them from
+a table of contents.
+"""
+
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Set
+
+from main import HTMLGenerator, detach_output, escape_html, iter_split
+
+DEFAULT_THRESHOLD = 1000
+DEFAULT_PAGE_SIZE = 500
+CHUNK_SIZE = 256
+
+# Section type -> (HTMLGenerator item method, entry separator, open tag, close tag)
+ITEMIZED_SECTIONS = {
+    "bullet_list": ("generate_bullet_item", "\n", "<ul>", "</ul>"),
+    "aligned_list": ("generate_aligned_list_item", "\n", "", ""),
+    "description_list": ("generate_description_list_item", "\n", "", ""),
+    "timeline": ("generate_experience_entry", "###", "", ""),
+}
+
+
+def iter_entries(section_data: Dict) -> Iterator[str]:
+    """The non-blank entries of an itemized section, split lazily."""
+    separator = ITEMIZED_SECTIONS[section_data["type"]][1]
+    return (
+        entry
+        for entry in iter_split(section_data["content"].strip(), separator)
+        if entry.strip()
+    )
+
+
+def count_entries(section_data: Dict) -> int:
+    """Number of entries in an itemized section (0 for other types)."""
+    if section_data["type"] not in ITEMIZED_SECTIONS:
+        return 0
+    return sum(1 for _ in iter_entries(section_data))
+
+
+def slugify(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or "section"
+
+
+class LargeDocumentWriter:
+    def __init__(
+        self,
+        generator: HTMLGenerator,
+        threshold: int = DEFAULT_THRESHOLD,
+        split_pages: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.generator = generator
+        self.threshold = threshold
+        self.split_pages = split_pages
+        self.page_size = page_size
+        self.chunk_size = chunk_size
+
+    def _page_path(
+        self, output_path: Path, number: int, section_data: Dict, page: int
+    ) -> Path:
+        slug = slugify(section_data["title"])
+        return output_path.with_name(
+            f"{output_path.stem}-{number + 1}-{slug}-{page}.html"
+        )
+
+    def _page_count(self, section_data: Dict) -> int:
+        return -(-count_entries(section_data) // self.page_size)
+
+    def write(self, parsed_data: Dict, output_path) -> List[Path]:
+        """Writes the document (and any split pages); returns every file written."""
+        output_path = Path(output_path)
+        sections = parsed_data["sections"]
+        large = {
+            number
+            for number, section_data in enumerate(sections)
+            if count_entries(section_data) > self.threshold
+        }
+        written = [output_path]
+
+        detach_output(output_path)
+        with open(output_path, "w", encoding="utf-8") as out:
+            out.write(self.generator.generate_document_start(parsed_data["header"]))
+            if large:
+                out.write(self.generate_toc(sections, large, output_path))
+            for number, section_data in enumerate(sections):
+                if large:
+                    out.write(f'<a id="section-{number + 1}"></a>')
+                if number not in large:
+                    out.write(self.generator.generate_section(section_data))
+                elif self.split_pages:
+                    written += self._write_pages(
+                        parsed_data["header"], section_data, number, output_path
+                    )
+                    out.write(
+                        self.generate_page_links(number, section_data, output_path)
+                    )
+                else:
+                    self._write_items(
+                        out,
+                        section_data["title"],
+                        section_data,
+                        iter_entries(section_data),
+                    )
+            out.write(self.generator.generate_document_end())
+        return written
+
+    def generate_toc(
+        self, sections: List[Dict], large: Set[int], output_path: Path
+    ) -> str:
+        html = '<nav class="toc"><h2>Contents</h2><ul>'
+        for number, section_data in enumerate(sections):
+            if number in large and self.split_pages:
+                href = self._page_path(output_path, number, section_data, 1).name
+            else:
+                href = f"#section-{number + 1}"
+            html += f'<li><a href="{escape_html(href)}">{escape_html(section_data["title"])}</a>'
+            if number in large:
+                html += f" ({count_entries(section_data):,} entries)"
+            html += "</li>"
+        html += "</ul></nav>"
+        return html
+
+    def generate_page_links(
+        self, number: int, section_data: Dict, output_path: Path
+    ) -> str:
+        page_count = self._page_count(section_data)
+        links = " ".join(
+            f'<a href="{escape_html(self._page_path(output_path, number, section_data, page).name)}">{page}</a>'
+            for page in range(1, page_count + 1)
+        )
+        return (
+            f"<h2>{escape_html(section_data['title'])}</h2>"
+            f'<p class="paragraph-content">{count_entries(section_data):,} entries '
+            f"on {page_count} pages: {links}</p>"
+        )
+
+    def _write_items(self, out, title: str, section_data: Dict, items: Iterator[str]):
+        method, _, open_tag, close_tag = ITEMIZED_SECTIONS[section_data["type"]]
+        render_item = getattr(self.generator, method)
+        out.write(f"<h2>{escape_html(title)}</h2>{open_tag}")
+        chunk = []
+        for item in items:
+            chunk.append(render_item(item))
+            if len(chunk) >= self.chunk_size:
+                out.write("".join(chunk))
+                chunk.clear()
+        out.write("".join(chunk))
+        out.write(close_tag)
+
+    def _write_pages(
+        self, header_info: Dict, section_data: Dict, number: int, output_path: Path
+    ) -> List[Path]:
+        page_count = self._page_count(section_data)
+        items = iter_entries(section_data)
+        written = []
+        for page in range(1, page_count + 1):
+            page_path = self._page_path(output_path, number, section_data, page)
+            nav = [
+                f'<a href="{escape_html(output_path.name)}#section-{number + 1}">Back to resume</a>'
+            ]
+            if page > 1:
+                previous = self._page_path(output_path, number, section_data, page - 1)
+                nav.append(f'<a href="{escape_html(previous.name)}">Previous</a>')
+            if page < page_count:
+                following = self._page_path(output_path, number, section_data, page + 1)
+                nav.append(f'<a href="{escape_html(following.name)}">Next</a>')
+            nav_html = f'<div class="page-nav">{" | ".join(nav)}</div>'
+
+            detach_output(page_path)
+            with open(page_path, "w", encoding="utf-8") as out:
+                out.write(
+                    self.generator.generate_document_start(
+                        {"name": header_info.get("name", "Resume")}
+                    )
+                )
+                out.write(nav_html)
+                self._write_items(
+                    out,
+                    f"{section_data['title']} ({page}/{page_count})",
+                    section_data,
+                    islice(items, self.page_size),
+                )
+                out.write(nav_html)
+                out.write(self.generator.generate_document_end())
+            written.append(page_path)
+        return written
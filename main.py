@@ -1,63 +1,96 @@
 #!/usr/bin/env python3
 """
 Resume Generator - Convert Markdown resume to styled HTML/PDF
-Usage: python resume_generator.py input.md [output.html]
+Usage: python main.py input.md [output.html] [--format pdf]
 """
 
 import argparse
+import os
 import re
 import sys
+import time
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Dict, List, Tuple
+from stat import S_ISLNK
+from string import Formatter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from metrics import MetricsLog
+from store import LINK_MODES, OutputStore
+
+# Patterns are compiled once per process and shared by every parser/generator.
+TITLE_SPEC_RE = re.compile(r"^\*\*([^*]+)\*\*(?:\s*\|\s*(.*))?$")
+ALIGNED_LIST_RE = re.compile(r"^\*\*(.+?):\*\*\s*(.*)$")
+DESCRIPTION_LIST_RE = re.compile(r"^\*\*(.+?)\*\*\s*-\s*(.*)$")
+LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+BOLD_RE = re.compile(r"\*\*([^*]+)\*\*")
+ITALIC_RE = re.compile(r"_([^_]+)_")
+# Schemes browsers would execute from an href; checked after dropping the
+# whitespace and control characters browsers ignore inside a scheme
+UNSAFE_URL_RE = re.compile(r"^(?:javascript|vbscript|data):", re.IGNORECASE)
+URL_IGNORED_CHARS_RE = re.compile(r"[\x00-\x20]")
+
+# Per-document counters (warnings, cache hits) while render_file is running
+_render_stats: ContextVar[Optional[Dict]] = ContextVar("render_stats", default=None)
+
+# CSS path -> (mtime_ns, size, content), shared by every generator in the process
+_css_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
+def escape_html(text: str) -> str:
+    """Escapes &, <, >, " and ' so text is safe in element content and attributes."""
+    # Five C-level replaces: much faster in CPython than a str.translate table
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#x27;")
+    )
+
+
+def escape_url(url: str) -> str:
+    """Escapes a URL for an href attribute, neutralizing script-bearing schemes."""
+    if UNSAFE_URL_RE.match(URL_IGNORED_CHARS_RE.sub("", url)):
+        return "#"
+    return escape_html(url)
+
+
+def warn(message: str):
+    """Prints a warning to stderr and records it for the current document."""
+    print(f"Warning: {message}", file=sys.stderr)
+    stats = _render_stats.get()
+    if stats is not None:
+        stats["warnings"].append(message)
+
+
+def read_css(css_file_path: str) -> str:
+    """Reads a stylesheet, reusing the cached copy while the file is unchanged."""
+    stat = os.stat(css_file_path)
+    cached = _css_cache.get(css_file_path)
+    stats = _render_stats.get()
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        if stats is not None:
+            stats["cache_hits"] += 1
+        return cached[2]
+    with open(css_file_path, "r", encoding="utf-8") as css_file:
+        css_content = css_file.read()
+    _css_cache[css_file_path] = (stat.st_mtime_ns, stat.st_size, css_content)
+    if stats is not None:
+        stats["cache_misses"] += 1
+    return css_content
 
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, registry: Optional["SectionRegistry"] = None):
         self.sections_list = []
         self.header_info = {}
+        self.registry = registry or SECTION_TYPES
 
     def _determine_section_type(self, content_lines: List[str]) -> str:
         """Determines the type of a section based on its content lines."""
         actual_content_lines = [line.strip() for line in content_lines if line.strip()]
-
-        if not actual_content_lines:
-            return "paragraph"
-
-        # 1. Timeline (### Company | Role)
-        if any(line.startswith("### ") for line in actual_content_lines):
-            return "timeline"
-
-        # 2. Aligned List (**Category:** Details)
-        aligned_list_pattern = r"^\*\*(.+?):\*\*\s*(.*)$"
-        aligned_matches = 0
-        for line in actual_content_lines:
-            if re.match(aligned_list_pattern, line):
-                aligned_matches += 1
-        if aligned_matches > 0 and (aligned_matches / len(actual_content_lines)) >= 0.5:
-            return "aligned_list"
-
-        # 3. Description List (**Term** - Description)
-        description_list_pattern = r"^\*\*(.+?)\*\*\s*-\s*(.*)$"
-        description_matches = 0
-        for line in actual_content_lines:
-            if re.match(description_list_pattern, line):
-                description_matches += 1
-        if (
-            description_matches > 0
-            and (description_matches / len(actual_content_lines)) >= 0.5
-        ):
-            return "description_list"
-
-        # 4. Bullet List (- Item)
-        bullet_lines = 0
-        for line in actual_content_lines:
-            if line.startswith("- "):
-                bullet_lines += 1
-
-        if bullet_lines > 0 and (bullet_lines / len(actual_content_lines)) >= 0.5:
-            return "bullet_list"
-
-        return "paragraph"
+        return self.registry.detect(actual_content_lines)
 
     def parse_markdown(self, content: str) -> Dict:
         """Parse markdown content and extract resume sections with their types"""
@@ -94,9 +127,7 @@ class ResumeParser:
                 continue
 
             # 2. Title/Specialization (must be after name, before sections)
-            title_spec_match = re.match(
-                r"^\*\*([^*]+)\*\*(?:\s*\|\s*(.*))?$", original_line_stripped
-            )
+            title_spec_match = TITLE_SPEC_RE.match(original_line_stripped)
             if (
                 self.header_info.get("name")
                 and not self.header_info.get("title")
@@ -156,11 +187,15 @@ class ResumeParser:
 
 
 class HTMLGenerator:
-    def __init__(self, css_file_path="style.css"):
+    def __init__(
+        self, css_file_path="style.css", registry: Optional["SectionRegistry"] = None
+    ):
         self.css_file_path = css_file_path
+        self.registry = registry or SECTION_TYPES
 
     def _process_text_segment(self, segment: str) -> str:
-        """Processes a non-URL text segment for bold and italic."""
+        """Escapes a non-URL text segment, then applies bold and italic."""
+        segment = escape_html(segment)
         segment = self.process_bold(segment)
         segment = self.process_italic(segment)
         return segment
@@ -171,12 +206,12 @@ class HTMLGenerator:
         Ensures that URLs are not affected by bold/italic processing.
         Processes bold/italic on link text and surrounding text.
         """
+        if "](" not in text:
+            return self._process_text_segment(text)
+
         output_parts = []
         last_end = 0
-        # Regex to find Markdown links: [text](url)
-        link_pattern = r"\[([^\]]+)\]\(([^)]+)\)"
-
-        for match in re.finditer(link_pattern, text):
+        for match in LINK_RE.finditer(text):
             start, end = match.span()
 
             # Process text before the link
@@ -188,7 +223,9 @@ class HTMLGenerator:
 
             processed_link_text = self._process_text_segment(link_text_md)
 
-            output_parts.append(f'<a href="{url}">{processed_link_text}</a>')
+            output_parts.append(
+                f'<a href="{escape_url(url)}">{processed_link_text}</a>'
+            )
 
             last_end = end
 
@@ -199,11 +236,15 @@ class HTMLGenerator:
 
     def process_bold(self, text: str) -> str:
         """Convert markdown bold to HTML"""
-        return re.sub(r"\*\*([^*]+)\*\*", r"<strong>\1</strong>", text)
+        if "**" not in text:
+            return text
+        return BOLD_RE.sub(r"<strong>\1</strong>", text)
 
     def process_italic(self, text: str) -> str:
         """Convert markdown italic to HTML"""
-        return re.sub(r"_([^_]+)_", r"<em>\1</em>", text)
+        if "_" not in text:
+            return text
+        return ITALIC_RE.sub(r"<em>\1</em>", text)
 
     def process_text(self, text: str) -> str:
         """Process all markdown formatting (links, bold, italic) safely."""
@@ -236,7 +277,7 @@ class HTMLGenerator:
         lines = content.strip().split("\n")
         for line in lines:
             line = line.strip()  # Ensure line is stripped before regex
-            match = re.match(r"^\*\*(.+?):\*\*\s*(.*)$", line)
+            match = ALIGNED_LIST_RE.match(line)
             if match:
                 category = match.group(1).strip()
                 skill_list = match.group(2).strip()
@@ -246,7 +287,7 @@ class HTMLGenerator:
     def generate_header(self, header_info: Dict) -> str:
         html = '<div class="header-section">'
         if "name" in header_info:
-            html += f"<h1>{header_info['name']}</h1>"
+            html += f"<h1>{escape_html(header_info['name'])}</h1>"
         if "title" in header_info and "specialization" in header_info:
             html += f'<div class="subtitle"><strong>{self.process_text(header_info["title"])}</strong> | {self.process_text(header_info["specialization"])}</div>'
         elif "title" in header_info:
@@ -263,90 +304,95 @@ class HTMLGenerator:
         """Generates an HTML section with a title and a paragraph."""
         processed_content = self.process_text(content)
         if not processed_content.strip():
-            return f"<h2>{title}</h2>"
+            return f"<h2>{escape_html(title)}</h2>"
         return f"""
-        <h2>{title}</h2>
+        <h2>{escape_html(title)}</h2>
         <p class=\"paragraph-content\">{processed_content}</p>
         """
 
+    def generate_bullet_item(self, line: str) -> str:
+        processed_line = self.process_text(line.lstrip("- ").strip())
+        if processed_line:
+            return f"<li>{processed_line}</li>"
+        return ""
+
     def generate_generic_bullet_list_section(self, title: str, content: str) -> str:
         """Generates an HTML section with a title and a bullet list."""
-        html_content = f"<h2>{title}</h2><ul>"
-        lines = content.strip().split("\n")
-        for line in lines:
-            processed_line = self.process_text(line.lstrip("- ").strip())
-            if processed_line:
-                html_content += f"<li>{processed_line}</li>"
+        html_content = f"<h2>{escape_html(title)}</h2><ul>"
+        for line in iter_split(content.strip()):
+            html_content += self.generate_bullet_item(line)
         html_content += "</ul>"
         return html_content
 
+    def generate_experience_entry(self, entry: str) -> str:
+        entry = entry.strip()
+        job_data = self.parse_experience_entry(entry) if entry else {}
+        if not job_data:
+            return ""
+        html = '<div class="list-item-container-flex">'
+        html += f'<span><span class="item-name">{self.process_text(job_data["company"])}</span>'
+        if job_data["role"]:
+            html += f" | {self.process_text(job_data['role'])}"
+        html += "</span>"
+        if job_data["date"]:
+            html += f'<span class="item-meta">{self.process_text(job_data["date"])}</span>'
+        html += "</div>"
+        if job_data["bullets"]:
+            html += "<ul>"
+            for bullet in job_data["bullets"]:
+                html += f"<li>{self.process_text(bullet)}</li>"
+            html += "</ul>"
+        return html
+
     def generate_experience(self, title: str, content: str) -> str:
-        html = f"<h2>{title}</h2>"
-        entries = content.split("###")
-        entries = [entry.strip() for entry in entries if entry.strip()]
-        for entry in entries:
-            job_data = self.parse_experience_entry(entry)
-            if not job_data:
-                continue
-            html += '<div class="list-item-container-flex">'
-            html += f'<span><span class="item-name">{self.process_text(job_data["company"])}</span>'
-            if job_data["role"]:
-                html += f" | {self.process_text(job_data['role'])}"
-            html += "</span>"
-            if job_data["date"]:
-                html += f'<span class="item-meta">{self.process_text(job_data["date"])}</span>'
-            html += "</div>"
-            if job_data["bullets"]:
-                html += "<ul>"
-                for bullet in job_data["bullets"]:
-                    html += f"<li>{self.process_text(bullet)}</li>"
-                html += "</ul>"
+        html = f"<h2>{escape_html(title)}</h2>"
+        for entry in iter_split(content, "###"):
+            html += self.generate_experience_entry(entry)
         return html
 
+    def generate_aligned_list_item(self, line: str) -> str:
+        match = ALIGNED_LIST_RE.match(line.strip())
+        if not match:
+            return ""
+        processed_category = self.process_text(match.group(1).strip())
+        processed_skill_list = self.process_text(match.group(2).strip())
+        return f'<div class="aligned-list-item"><strong>{processed_category}:</strong> {processed_skill_list}</div>'
+
     def generate_technical_expertise(self, title: str, content: str) -> str:
-        skills = self.parse_technical_expertise(content)
-        html = f"<h2>{title}</h2>"
-        for category, skill_list in skills:
-            processed_category = self.process_text(category)
-            processed_skill_list = self.process_text(skill_list)
-            html += f'<div class="aligned-list-item"><strong>{processed_category}:</strong> {processed_skill_list}</div>'
+        html = f"<h2>{escape_html(title)}</h2>"
+        for line in iter_split(content.strip()):
+            html += self.generate_aligned_list_item(line)
+        return html
+
+    def generate_description_list_item(self, line: str) -> str:
+        match = DESCRIPTION_LIST_RE.match(line.strip())
+        if not match:
+            return ""
+        term = self.process_text(match.group(1).strip())
+        description = self.process_text(match.group(2).strip())
+
+        html = '<div class="simple-list-item">'
+        html += f'<strong class="item-name">{term}</strong>'
+        if description:
+            html += f" - {description}"
+        html += "</div>"
         return html
 
     def generate_description_list_section(self, title: str, content: str) -> str:
         """Generates an HTML section for a description list (e.g., **Term** - Definition)."""
-        html = f"<h2>{title}</h2>"
-        lines = content.strip().split("\n")
-        item_pattern = r"^\*\*(.+?)\*\*\s*-\s*(.*)$"
-        for line_content in lines:
-            line = line_content.strip()
-            match = re.match(item_pattern, line)
-            if match:
-                term = self.process_text(match.group(1).strip())
-                description = self.process_text(match.group(2).strip())
-
-                html += '<div class="simple-list-item">'
-                html += f'<strong class="item-name">{term}</strong>'
-                if (
-                    description
-                ):
-                    html += f" - {description}"
-                html += "</div>"
+        html = f"<h2>{escape_html(title)}</h2>"
+        for line in iter_split(content.strip()):
+            html += self.generate_description_list_item(line)
         return html
 
-    def generate_html(self, parsed_data: Dict) -> str:
-        header_info = parsed_data["header"]
-        sections = parsed_data["sections"]
-
+    def generate_document_start(self, header_info: Dict) -> str:
+        """Everything up to and including the opening content wrapper."""
         css_content = ""
-        css_link_tag = f'<link rel="stylesheet" href="{self.css_file_path}">\n'
+        css_link_tag = f'<link rel="stylesheet" href="{escape_html(self.css_file_path)}">\n'
         try:
-            with open(self.css_file_path, "r", encoding="utf-8") as css_file:
-                css_content = css_file.read()
+            css_content = read_css(self.css_file_path)
         except Exception as e:
-            print(
-                f"Warning: Could not read CSS file '{self.css_file_path}': {e}",
-                file=sys.stderr,
-            )
+            warn(f"Could not read CSS file '{self.css_file_path}': {e}")
             css_content = ""
             css_link_tag = ""
 
@@ -355,56 +401,420 @@ class HTMLGenerator:
 <head>
     <meta charset=\"UTF-8\">
     <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
-    <title>{header_info.get("name", "Resume")}</title>
+    <title>{escape_html(header_info.get("name", "Resume"))}</title>
     {css_link_tag}<style>\n{css_content}\n</style>
 </head>
 <body>
 """
         html += self.generate_header(header_info)
         html += '<div class="content-wrapper">'
+        return html
 
-        section_type_renderers = {
-            "timeline": self.generate_experience,
-            "aligned_list": self.generate_technical_expertise,
-            "bullet_list": self.generate_generic_bullet_list_section,
-            "paragraph": self.generate_generic_paragraph_section,
-            "description_list": self.generate_description_list_section,
-        }
-
-        for section_data in sections:
-            section_title = section_data["title"]
-            section_type = section_data["type"]
-            section_content = section_data["content"]
-
-            if section_type in section_type_renderers:
-                html += section_type_renderers[section_type](
-                    section_title, section_content
-                )
-            else:
-                print(
-                    f"Warning: Unknown section type '{section_type}' for title '{section_title}'. Treating as paragraph.",
-                    file=sys.stderr,
-                )
-                html += self.generate_generic_paragraph_section(
-                    section_title, section_content
-                )
+    def generate_section(self, section_data: Dict) -> str:
+        section_title = section_data["title"]
+        section_type = section_data["type"]
+        section_content = section_data["content"]
 
-        html += "</div>"
+        if section_type in self.registry:
+            return self.registry[section_type].render(
+                self, section_title, section_content
+            )
+        warn(
+            f"Unknown section type '{section_type}' for title '{section_title}'. Treating as paragraph."
+        )
+        return self.generate_generic_paragraph_section(section_title, section_content)
+
+    def generate_document_end(self) -> str:
+        html = "</div>"
         html += '<div class="no-print"><strong>📄 To save as PDF:</strong> Press Ctrl+P (or Cmd+P on Mac) and select "Save as PDF"</div>'
         html += "</body></html>"
         return html
 
+    def generate_html(self, parsed_data: Dict) -> str:
+        html = self.generate_document_start(parsed_data["header"])
+        for section_data in parsed_data["sections"]:
+            html += self.generate_section(section_data)
+        html += self.generate_document_end()
+        return html
+
+
+def iter_split(text: str, separator: str = "\n") -> Iterator[str]:
+    """Lazy text.split(separator): yields one piece at a time."""
+    start = 0
+    while True:
+        end = text.find(separator, start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + len(separator)
+
+
+def _compile_template(template: str) -> Callable[[Dict[str, str]], str]:
+    """
+    Splits a template of {field} placeholders once so rendering is a plain
+    join. Fields str.format would treat specially (positional, attribute or
+    index lookups, conversions, format specs) are rejected with ValueError.
+    """
+    parts = list(Formatter().parse(template))
+    for _, field_name, format_spec, conversion in parts:
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or conversion is not None or format_spec:
+            raise ValueError(
+                f"Unsupported template field '{{{field_name}"
+                + (f"!{conversion}" if conversion else "")
+                + (f":{format_spec}" if format_spec else "")
+                + "}': only plain {name} fields are allowed"
+            )
+
+    def render(fields: Dict[str, str]) -> str:
+        out = []
+        for literal, field_name, _, _ in parts:
+            out.append(literal)
+            if field_name is not None:
+                out.append(fields[field_name])
+        return "".join(out)
+
+    return render
+
+
+def _majority(predicate: Callable[[str], object]) -> Callable[[List[str]], bool]:
+    """Detector that matches when at least half of the lines satisfy predicate."""
+
+    def detect(lines: List[str]) -> bool:
+        matches = sum(1 for line in lines if predicate(line))
+        return matches > 0 and (matches / len(lines)) >= 0.5
+
+    return detect
+
+
+class SectionType:
+    """
+    A section type: how to detect it, how to parse it and how to render it.
+
+    Built-in types render through an HTMLGenerator method (``renderer``).
+    Custom types can instead provide a ``parser`` that turns section content
+    into a list of field dicts and a ``template`` with plain ``{field}``
+    placeholders that is filled once per item with the inline-formatted fields.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        detector: Optional[Callable[[List[str]], bool]] = None,
+        renderer: Optional[str] = None,
+        parser: Optional[Callable[[str], List[Dict[str, str]]]] = None,
+        template: Optional[str] = None,
+    ):
+        if renderer is None and (parser is None or template is None):
+            raise ValueError(
+                f"Section type '{name}' needs either a renderer or a parser and a template"
+            )
+        self.name = name
+        self.detector = detector
+        self.renderer = renderer
+        self.parser = parser
+        self.template = template
+        self._render_item = _compile_template(template) if template else None
+
+    def render(self, generator: "HTMLGenerator", title: str, content: str) -> str:
+        if self.renderer:
+            return getattr(generator, self.renderer)(title, content)
+        html = f"<h2>{escape_html(title)}</h2>"
+        for item in self.parser(content):
+            html += self._render_item(
+                {key: generator.process_text(value) for key, value in item.items()}
+            )
+        return html
+
+
+class SectionRegistry:
+    """Ordered collection of section types; detectors are tried in order."""
+
+    def __init__(self, fallback: str = "paragraph"):
+        self.fallback = fallback
+        self._types: Dict[str, SectionType] = {}
+
+    def register(self, section_type: SectionType, before: Optional[str] = None):
+        """Adds (or replaces) a section type, optionally ahead of another one."""
+        self._types.pop(section_type.name, None)
+        if before is None:
+            self._types[section_type.name] = section_type
+            return
+        if before not in self._types:
+            raise KeyError(f"Unknown section type '{before}'")
+        reordered = {}
+        for name, existing in self._types.items():
+            if name == before:
+                reordered[section_type.name] = section_type
+            reordered[name] = existing
+        self._types = reordered
+
+    def unregister(self, name: str):
+        del self._types[name]
+
+    def detect(self, lines: List[str]) -> str:
+        """Returns the first type whose detector accepts the stripped, non-empty lines."""
+        if lines:
+            for section_type in self._types.values():
+                if section_type.detector and section_type.detector(lines):
+                    return section_type.name
+        return self.fallback
+
+    def copy(self) -> "SectionRegistry":
+        registry = SectionRegistry(self.fallback)
+        registry._types = dict(self._types)
+        return registry
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._types
+
+    def __getitem__(self, name: str) -> SectionType:
+        return self._types[name]
+
+
+SECTION_TYPES = SectionRegistry()
+SECTION_TYPES.register(
+    SectionType(
+        "timeline",
+        detector=lambda lines: any(line.startswith("### ") for line in lines),
+        renderer="generate_experience",
+    )
+)
+SECTION_TYPES.register(
+    SectionType(
+        "aligned_list",
+        detector=_majority(ALIGNED_LIST_RE.match),
+        renderer="generate_technical_expertise",
+    )
+)
+SECTION_TYPES.register(
+    SectionType(
+        "description_list",
+        detector=_majority(DESCRIPTION_LIST_RE.match),
+        renderer="generate_description_list_section",
+    )
+)
+SECTION_TYPES.register(
+    SectionType(
+        "bullet_list",
+        detector=_majority(lambda line: line.startswith("- ")),
+        renderer="generate_generic_bullet_list_section",
+    )
+)
+SECTION_TYPES.register(
+    SectionType("paragraph", renderer="generate_generic_paragraph_section")
+)
+
+
+OUTPUT_FORMATS = ("html", "pdf")
+
+
+def read_input(input_path) -> Tuple[str, int]:
+    """Reads a Markdown resume; returns its text and size in bytes."""
+    with open(input_path, "r", encoding="utf-8") as f:
+        return f.read(), os.fstat(f.fileno()).st_size
+
+
+def count_sections(parsed_data: Dict) -> Dict[str, int]:
+    section_counts = {}
+    for section_data in parsed_data["sections"]:
+        section_type = section_data["type"]
+        section_counts[section_type] = section_counts.get(section_type, 0) + 1
+    return section_counts
+
+
+def render_markdown(
+    markdown_content: str,
+    style: str = "style.css",
+    output_format: str = "html",
+    metrics: Optional[Dict] = None,
+) -> Union[str, bytes]:
+    """
+    Parses and renders a resume held in memory: HTML as str, PDF as bytes.
+    Section counts, parse/render durations, warnings and CSS cache use are
+    recorded into metrics when given.
+    """
+    if metrics is None:
+        metrics = {}
+    metrics.setdefault("warnings", [])
+    metrics.setdefault("cache_hits", 0)
+    metrics.setdefault("cache_misses", 0)
+    token = _render_stats.set(metrics)
+    try:
+        started = time.perf_counter()
+        parsed_data = ResumeParser().parse_markdown(markdown_content)
+        parsed = time.perf_counter()
+        if output_format == "pdf":
+            from pdf import PDFGenerator  # pdf.py imports this module
+
+            output = PDFGenerator().generate_pdf(parsed_data)
+        else:
+            output = HTMLGenerator(css_file_path=style).generate_html(parsed_data)
+        rendered = time.perf_counter()
+    finally:
+        _render_stats.reset(token)
+    metrics.update(
+        sections=count_sections(parsed_data),
+        parse_s=parsed - started,
+        render_s=rendered - parsed,
+    )
+    return output
+
+
+def detach_output(output_path):
+    """
+    Removes output_path if it is a symlink or a hardlink shared with another
+    path, so that writing it next replaces the link instead of modifying the
+    file behind it (e.g. an object in an output store). Every writer of
+    output files calls this before opening them.
+    """
+    try:
+        stat = os.lstat(output_path)
+    except FileNotFoundError:
+        return
+    if S_ISLNK(stat.st_mode) or stat.st_nlink > 1:
+        os.unlink(output_path)
+
+
+def write_output(output_path, output: Union[str, bytes]) -> int:
+    """Writes rendered HTML (str) or PDF (bytes); returns the bytes written."""
+    detach_output(output_path)
+    if isinstance(output, bytes):
+        with open(output_path, "wb") as f:
+            f.write(output)
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(output)
+    return os.path.getsize(output_path)
+
+
+def render_file(
+    input_path,
+    output_path,
+    style: str = "style.css",
+    output_format: str = "html",
+    large_threshold: Optional[int] = None,
+    split_pages: bool = False,
+    page_size: Optional[int] = None,
+    store: Optional[OutputStore] = None,
+) -> Dict:
+    """
+    Reads a Markdown resume, renders it and writes it to output_path.
+    With large_threshold, HTML sections with more entries than that are
+    streamed in chunks (or moved to split pages) instead of built in memory.
+    With store, output_path becomes a link into that content-addressed store
+    (not supported together with large_threshold).
+
+    Returns the document's metrics: sizes, section counts by type, stage
+    durations in seconds, CSS cache hits and warnings.
+    """
+    metrics = {
+        "input": str(input_path),
+        "output": str(output_path),
+        "format": output_format,
+        "warnings": [],
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+    started = time.perf_counter()
+    markdown_content, metrics["input_bytes"] = read_input(input_path)
+    metrics["read_s"] = time.perf_counter() - started
+
+    if output_format == "html" and large_threshold is not None:
+        if store:
+            raise ValueError("A large-document render cannot use an output store")
+        from large import DEFAULT_PAGE_SIZE, LargeDocumentWriter
+
+        token = _render_stats.set(metrics)
+        try:
+            started = time.perf_counter()
+            parsed_data = ResumeParser().parse_markdown(markdown_content)
+            parsed = time.perf_counter()
+            # Rendering and writing are interleaved, so both count as render time
+            output_paths = LargeDocumentWriter(
+                HTMLGenerator(css_file_path=style),
+                threshold=large_threshold,
+                split_pages=split_pages,
+                page_size=DEFAULT_PAGE_SIZE if page_size is None else page_size,
+            ).write(parsed_data, output_path)
+            rendered = time.perf_counter()
+        finally:
+            _render_stats.reset(token)
+        metrics.update(
+            output_bytes=sum(os.path.getsize(path) for path in output_paths),
+            sections=count_sections(parsed_data),
+            parse_s=parsed - started,
+            render_s=rendered - parsed,
+            write_s=0.0,
+        )
+        return metrics
+
+    output = render_markdown(markdown_content, style, output_format, metrics)
+    started = time.perf_counter()
+    if store:
+        metrics["output_bytes"], metrics["deduplicated"] = store.write(
+            output_path, output
+        )
+    else:
+        metrics["output_bytes"] = write_output(output_path, output)
+    metrics["write_s"] = time.perf_counter() - started
+    return metrics
+
 
 def main():
     parser = argparse.ArgumentParser(description="Generate HTML resume from Markdown")
     parser.add_argument("input_file", help="Input markdown file")
-    parser.add_argument("output_file", nargs="?", help="Output HTML file (optional)")
+    parser.add_argument(
+        "output_file", nargs="?", help="Output HTML or PDF file (optional)"
+    )
     parser.add_argument(
         "--style",
         "-s",
         default="style.css",
         help="Path to custom CSS file (default: style.css)",
     )
+    parser.add_argument(
+        "--format",
+        "-f",
+        choices=OUTPUT_FORMATS,
+        default="html",
+        help="Output format (default: html)",
+    )
+    parser.add_argument(
+        "--large-sections",
+        type=int,
+        metavar="N",
+        help="Stream sections with more than N entries in chunks and add a table of contents",
+    )
+    parser.add_argument(
+        "--split-pages",
+        action="store_true",
+        help="With --large-sections, move large sections to separate paginated files",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        metavar="N",
+        help="Entries per split page (default: 500)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Append a JSON line with this run's metrics to PATH",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="Keep the output in a content-addressed store and link it into place",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="hardlink",
+        help="How --store links outputs into place (default: hardlink)",
+    )
     args = parser.parse_args()
 
     input_path = Path(args.input_file)
@@ -415,27 +825,57 @@ def main():
     if args.output_file:
         output_path = Path(args.output_file)
     else:
-        output_path = input_path.with_suffix(".html")
-
-    try:
-        with open(input_path, "r", encoding="utf-8") as f:
-            markdown_content = f.read()
+        output_path = input_path.with_suffix(f".{args.format}")
 
-        resume_parser = ResumeParser()
-        parsed_data = resume_parser.parse_markdown(markdown_content)
-
-        html_generator = HTMLGenerator(css_file_path=args.style)
-        html_content = html_generator.generate_html(parsed_data)
+    if args.store and args.large_sections is not None:
+        print("Error: --store cannot be combined with --large-sections")
+        sys.exit(1)
+    if args.format != "html" and (args.large_sections is not None or args.split_pages):
+        print("Error: --large-sections and --split-pages only apply to HTML output")
+        sys.exit(1)
+    if args.large_sections is not None and args.large_sections < 0:
+        print("Error: --large-sections cannot be negative")
+        sys.exit(1)
+    if args.split_pages and args.large_sections is None:
+        print("Error: --split-pages requires --large-sections")
+        sys.exit(1)
+    if args.page_size is not None and not args.split_pages:
+        print("Error: --page-size requires --split-pages")
+        sys.exit(1)
+    if args.page_size is not None and args.page_size < 1:
+        print("Error: --page-size must be at least 1")
+        sys.exit(1)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+    metrics_log = MetricsLog(args.metrics) if args.metrics else None
+    store = OutputStore(args.store, args.link) if args.store else None
+    try:
+        metrics = render_file(
+            input_path,
+            output_path,
+            args.style,
+            args.format,
+            args.large_sections,
+            args.split_pages,
+            args.page_size,
+            store,
+        )
+        if metrics_log:
+            metrics_log.record(metrics)
 
         print(f"Resume generated successfully: {output_path}")
-        print("To convert to PDF, open the HTML file in a browser and print to PDF")
+        if args.format == "html":
+            print("To convert to PDF, open the HTML file in a browser and print to PDF")
 
     except Exception as e:
+        if metrics_log:
+            metrics_log.record_failure(input_path, e)
         print(f"Error generating resume: {e}")
         sys.exit(1)
+    finally:
+        if metrics_log:
+            metrics_log.close()
+        if store:
+            store.close()
 
 
 if __name__ == "__main__":
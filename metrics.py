@@ -0,0 +1,81 @@
+"""
+Metrics Log - JSON-lines metrics for CLI and batch runs
+
+Writes one "document" line per rendered (or failed) file and, on close, one
+"summary" line with the run's totals and throughput. Lines are appended, so a
+single file collects a time series across runs.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+SUMMED_FIELDS = (
+    "input_bytes",
+    "output_bytes",
+    "read_s",
+    "parse_s",
+    "render_s",
+    "write_s",
+    "cache_hits",
+    "cache_misses",
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+class MetricsLog:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._started = time.perf_counter()
+        self.totals = dict.fromkeys(SUMMED_FIELDS, 0)
+        self.totals.update(documents=0, failed=0, warnings=0, deduplicated=0)
+
+    def _write(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def record(self, metrics: Dict):
+        """Logs the metrics returned by main.render_file for one document."""
+        self._write({"type": "document", "time": _now(), "error": None, **metrics})
+        self.totals["documents"] += 1
+        self.totals["warnings"] += len(metrics["warnings"])
+        self.totals["deduplicated"] += bool(metrics.get("deduplicated"))
+        for field in SUMMED_FIELDS:
+            self.totals[field] += metrics.get(field, 0)
+
+    def record_failure(self, input_path, error, metrics: Optional[Dict] = None):
+        record = {"type": "document", "time": _now(), "input": str(input_path)}
+        record.update(metrics or {})
+        record["error"] = str(error)
+        self._write(record)
+        self.totals["documents"] += 1
+        self.totals["failed"] += 1
+
+    def summary(self) -> Dict:
+        wall_s = time.perf_counter() - self._started
+        return {
+            "type": "summary",
+            "time": _now(),
+            **self.totals,
+            "wall_s": wall_s,
+            "docs_per_s": self.totals["documents"] / wall_s if wall_s else 0.0,
+            "input_mb_per_s": (
+                self.totals["input_bytes"] / 1e6 / wall_s if wall_s else 0.0
+            ),
+        }
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._write(self.summary())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
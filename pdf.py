@@ -0,0 +1,432 @@
+"""
+PDF Generator - Render a parsed resume straight to PDF, no browser involved
+
+Uses the standard Helvetica fonts every PDF viewer ships, so no font files
+are embedded. Inline formatting goes through HTMLGenerator.process_text so
+bold/italic/link handling (quirks included) matches the HTML output.
+"""
+
+import html as html_lib
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from main import DESCRIPTION_LIST_RE, SECTION_TYPES, HTMLGenerator
+
+PAGE_WIDTH = 612  # US Letter, in points, matching the stylesheet's 8.5in
+PAGE_HEIGHT = 792
+MARGIN = 43
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+
+BODY_SIZE = 10
+NAME_SIZE = 22
+HEADING_SIZE = 13
+FOOTER_SIZE = 8
+LINE_SPACING = 1.35
+BULLET_INDENT = 14
+DATE_GAP = 12  # between a timeline header and its date
+
+TEXT_COLOR = "0.176 0.216 0.282"
+LINK_COLOR = "0.102 0.051 0.671"
+RULE_COLOR = "0.4 0.494 0.918"
+
+# Resource name -> base font; Oblique variants share the upright metrics
+FONTS = {
+    "F1": "Helvetica",
+    "F2": "Helvetica-Bold",
+    "F3": "Helvetica-Oblique",
+    "F4": "Helvetica-BoldOblique",
+}
+
+# Glyph widths (1/1000 em) for ' ' (32) through '~' (126), from the Adobe AFMs
+# fmt: off
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278,
+    278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584,
+    584, 556, 1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556,
+    833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278,
+    278, 278, 469, 556, 333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222,
+    500, 222, 833, 556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500,
+    500, 334, 260, 334, 584,
+]
+_HELVETICA_BOLD_WIDTHS = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278,
+    278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584,
+    584, 611, 975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611,
+    833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333,
+    278, 333, 584, 556, 333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278,
+    556, 278, 889, 611, 611, 611, 611, 389, 556, 333, 611, 556, 778, 556, 556,
+    500, 389, 280, 389, 584,
+]
+# fmt: on
+_DEFAULT_WIDTH = 556
+
+INLINE_TAG_RE = re.compile(r'<(/?)(strong|em|a)(?: href="([^"]*)")?>')
+WORD_RE = re.compile(r"\S+|\s+")
+
+# A run is (text, bold, italic, url)
+Run = Tuple[str, bool, bool, Optional[str]]
+
+
+def _font_for(bold: bool, italic: bool) -> str:
+    return ("F1", "F3", "F2", "F4")[bold * 2 + italic]
+
+
+def text_width(text: str, bold: bool, size: float) -> float:
+    widths = _HELVETICA_BOLD_WIDTHS if bold else _HELVETICA_WIDTHS
+    total = 0
+    for char in text:
+        code = ord(char) - 32
+        total += widths[code] if 0 <= code < len(widths) else _DEFAULT_WIDTH
+    return total * size / 1000
+
+
+def _pdf_string(text: str) -> str:
+    """Escapes text for a PDF literal string; the stream is cp1252 encoded."""
+    text = text.encode("cp1252", errors="replace").decode("cp1252")
+    return (
+        "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+    )
+
+
+class _Canvas:
+    """Accumulates drawing operators page by page, breaking pages as needed."""
+
+    def __init__(self):
+        self.pages: List[List[str]] = []
+        self.links: List[List[Tuple[float, float, float, float, str]]] = []
+        self.new_page()
+
+    def new_page(self):
+        self.pages.append([])
+        self.links.append([])
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure(self, height: float):
+        if self.y - height < MARGIN and self.y < PAGE_HEIGHT - MARGIN:
+            self.new_page()
+
+    def text(self, x: float, y: float, text: str, font: str, size: float, color: str):
+        self.pages[-1].append(
+            f"{color} rg BT /{font} {size} Tf {x:.2f} {y:.2f} Td {_pdf_string(text)} Tj ET"
+        )
+
+    def rule(self, y: float, width: float = 0.75):
+        self.pages[-1].append(
+            f"{RULE_COLOR} RG {width} w {MARGIN} {y:.2f} m {PAGE_WIDTH - MARGIN} {y:.2f} l S"
+        )
+
+    def link(self, x: float, y: float, width: float, size: float, url: str):
+        self.links[-1].append((x, y - size * 0.2, x + width, y + size * 0.9, url))
+
+
+# HTMLGenerator renderer named by a SectionType -> PDFGenerator draw method
+DRAW_METHODS = {
+    "generate_experience": "draw_timeline",
+    "generate_technical_expertise": "draw_aligned_list",
+    "generate_description_list_section": "draw_description_list",
+    "generate_generic_bullet_list_section": "draw_bullet_list",
+    "generate_generic_paragraph_section": "draw_paragraph",
+}
+
+
+class PDFGenerator:
+    def __init__(self, registry=None):
+        self.html_generator = HTMLGenerator(registry=registry)
+        self.registry = registry or SECTION_TYPES
+
+    def parse_runs(
+        self, text: str, bold: bool = False, italic: bool = False
+    ) -> List[Run]:
+        """
+        Applies inline formatting and splits the result into styled runs; the
+        HTML escaping process_text adds is undone for text and link targets.
+        """
+        runs = []
+        base_bold, base_italic = bold, italic
+        url = None
+        last_end = 0
+        html = self.html_generator.process_text(text)
+        for match in INLINE_TAG_RE.finditer(html):
+            if match.start() > last_end:
+                runs.append(
+                    (
+                        html_lib.unescape(html[last_end : match.start()]),
+                        bold,
+                        italic,
+                        url,
+                    )
+                )
+            closing, tag, href = match.groups()
+            if tag == "strong":
+                bold = base_bold or not closing
+            elif tag == "em":
+                italic = base_italic or not closing
+            else:
+                url = None if closing else html_lib.unescape(href)
+            last_end = match.end()
+        if last_end < len(html):
+            runs.append((html_lib.unescape(html[last_end:]), bold, italic, url))
+        return runs
+
+    def _wrap(self, runs: List[Run], width: float, size: float) -> List[List[Tuple]]:
+        """
+        Greedy line breaking; returns lines of (x, text, bold, italic, url).
+        Neighbouring words in the same style are merged into one text item.
+        """
+        lines = [[]]
+        x = 0.0
+        space = ""
+        for text, bold, italic, url in runs:
+            for piece in WORD_RE.findall(text):
+                if piece.isspace():
+                    if lines[-1]:
+                        space = " "
+                    continue
+                piece_width = text_width(space + piece, bold, size)
+                if x + piece_width > width and lines[-1]:
+                    lines.append([])
+                    x, space = 0.0, ""
+                    piece_width = text_width(piece, bold, size)
+                line = lines[-1]
+                if line and line[-1][2:] == (bold, italic, url):
+                    start_x, previous = line[-1][:2]
+                    line[-1] = (start_x, previous + space + piece, bold, italic, url)
+                else:
+                    if space:
+                        x += text_width(space, bold, size)
+                        piece_width -= text_width(space, bold, size)
+                    line.append((x, piece, bold, italic, url))
+                x += piece_width
+                space = ""
+        return [line for line in lines if line]
+
+    def draw_text(
+        self,
+        canvas: _Canvas,
+        runs: List[Run],
+        size: float = BODY_SIZE,
+        indent: float = 0,
+        align: str = "left",
+        bullet: bool = False,
+        width: float = CONTENT_WIDTH,
+    ):
+        line_height = size * LINE_SPACING
+        for number, line in enumerate(self._wrap(runs, width - indent, size)):
+            canvas.ensure(line_height)
+            canvas.y -= line_height
+            baseline = canvas.y + (line_height - size) / 2
+            left = MARGIN + indent
+            if align == "center":
+                end_x, last, last_bold = line[-1][0], line[-1][1], line[-1][2]
+                line_width = end_x + text_width(last, last_bold, size)
+                left = MARGIN + (CONTENT_WIDTH - line_width) / 2
+            if bullet and number == 0:
+                canvas.text(
+                    left - BULLET_INDENT + 4, baseline, "\u2022", "F1", size, TEXT_COLOR
+                )
+            for x, text, bold, italic, url in line:
+                color = LINK_COLOR if url else TEXT_COLOR
+                canvas.text(
+                    left + x, baseline, text, _font_for(bold, italic), size, color
+                )
+                if url:
+                    canvas.link(
+                        left + x, baseline, text_width(text, bold, size), size, url
+                    )
+
+    def draw_header(self, canvas: _Canvas, header_info: Dict):
+        if "name" in header_info:
+            self.draw_text(
+                canvas,
+                [(header_info["name"], True, False, None)],
+                NAME_SIZE,
+                align="center",
+            )
+        if "title" in header_info:
+            runs = self.parse_runs(header_info["title"], bold=True)
+            if "specialization" in header_info:
+                runs.append((" | ", False, False, None))
+                runs += self.parse_runs(header_info["specialization"])
+            self.draw_text(canvas, runs, BODY_SIZE + 2, align="center")
+        if "contact" in header_info:
+            runs = []
+            for number, line in enumerate(header_info["contact"]):
+                if number:
+                    runs.append((" | ", False, False, None))
+                runs += self.parse_runs(line)
+            self.draw_text(canvas, runs, BODY_SIZE - 1, align="center")
+        canvas.y -= 6
+        canvas.rule(canvas.y, 2)
+        canvas.y -= 6
+
+    def draw_heading(self, canvas: _Canvas, title: str):
+        # Keep the heading on the same page as at least one line of content
+        canvas.ensure(HEADING_SIZE * LINE_SPACING + 8 + BODY_SIZE * LINE_SPACING)
+        canvas.y -= 8
+        self.draw_text(canvas, self.parse_runs(title, bold=True), HEADING_SIZE)
+        canvas.rule(canvas.y - 1)
+        canvas.y -= 4
+
+    def draw_bullets(self, canvas: _Canvas, items: List[str]):
+        for item in items:
+            self.draw_text(
+                canvas, self.parse_runs(item), indent=BULLET_INDENT, bullet=True
+            )
+
+    def draw_timeline(self, canvas: _Canvas, content: str):
+        entries = [entry.strip() for entry in content.split("###") if entry.strip()]
+        for entry in entries:
+            job_data = self.html_generator.parse_experience_entry(entry)
+            if not job_data:
+                continue
+            canvas.y -= 3
+            runs = self.parse_runs(job_data["company"], bold=True)
+            if job_data["role"]:
+                runs.append((" | ", False, False, None))
+                runs += self.parse_runs(job_data["role"])
+            date = "".join(
+                run[0] for run in self.parse_runs(job_data["date"], italic=True)
+            )
+            date_size = BODY_SIZE - 1
+            # The header wraps short of the right-aligned date
+            width = CONTENT_WIDTH
+            if date:
+                width -= text_width(date, False, date_size) + DATE_GAP
+            # Keep the header on one page so the date stays beside its first line
+            line_height = BODY_SIZE * LINE_SPACING
+            canvas.ensure(len(self._wrap(runs, width, BODY_SIZE)) * line_height)
+            first_baseline = canvas.y - line_height + (line_height - BODY_SIZE) / 2
+            self.draw_text(canvas, runs, width=width)
+            if date:
+                canvas.text(
+                    PAGE_WIDTH - MARGIN - text_width(date, False, date_size),
+                    first_baseline,
+                    date,
+                    "F3",
+                    date_size,
+                    TEXT_COLOR,
+                )
+            self.draw_bullets(canvas, job_data["bullets"])
+
+    def draw_aligned_list(self, canvas: _Canvas, content: str):
+        for category, skill_list in self.html_generator.parse_technical_expertise(
+            content
+        ):
+            runs = self.parse_runs(category, bold=True) + [(": ", True, False, None)]
+            self.draw_text(canvas, runs + self.parse_runs(skill_list))
+
+    def draw_description_list(self, canvas: _Canvas, content: str):
+        for line in content.strip().split("\n"):
+            match = DESCRIPTION_LIST_RE.match(line.strip())
+            if match:
+                runs = self.parse_runs(match.group(1).strip(), bold=True)
+                if match.group(2).strip():
+                    runs += [(" - ", False, False, None)]
+                    runs += self.parse_runs(match.group(2).strip())
+                self.draw_text(canvas, runs)
+
+    def draw_bullet_list(self, canvas: _Canvas, content: str):
+        items = [line.lstrip("- ").strip() for line in content.strip().split("\n")]
+        self.draw_bullets(canvas, [item for item in items if item])
+
+    def draw_paragraph(self, canvas: _Canvas, content: str):
+        if content.strip():
+            self.draw_text(canvas, self.parse_runs(content))
+
+    def draw_section(self, canvas: _Canvas, section: Dict):
+        """
+        Draws a section the way its registered type renders in HTML. Types
+        without an HTMLGenerator renderer (template types, whose templates
+        only target HTML) and unknown types are drawn as paragraphs.
+        """
+        self.draw_heading(canvas, section["title"])
+        draw = None
+        if section["type"] in self.registry:
+            draw = DRAW_METHODS.get(self.registry[section["type"]].renderer)
+        getattr(self, draw or "draw_paragraph")(canvas, section["content"])
+
+    def generate_pdf(self, parsed_data: Dict) -> bytes:
+        canvas = _Canvas()
+        self.draw_header(canvas, parsed_data["header"])
+        for section in parsed_data["sections"]:
+            self.draw_section(canvas, section)
+
+        page_count = len(canvas.pages)
+        if page_count > 1:
+            for number, ops in enumerate(canvas.pages, 1):
+                label = f"{number} / {page_count}"
+                x = (PAGE_WIDTH - text_width(label, False, FOOTER_SIZE)) / 2
+                ops.append(
+                    f"{TEXT_COLOR} rg BT /F1 {FOOTER_SIZE} Tf {x:.2f} {MARGIN / 2:.2f} Td ({label}) Tj ET"
+                )
+        return self._serialize(canvas, parsed_data["header"].get("name", "Resume"))
+
+    def _serialize(self, canvas: _Canvas, title: str) -> bytes:
+        objects: List[bytes] = []
+
+        def add(body: bytes) -> int:
+            objects.append(body)
+            return len(objects)
+
+        catalog = add(b"")
+        pages = add(b"")
+        info = add(
+            f"<< /Title {_pdf_string(title)} /Producer (resume.md) >>".encode("cp1252")
+        )
+        font_refs = " ".join(
+            f"/{name} {add(f'<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>'.encode())} 0 R"
+            for name, base in FONTS.items()
+        )
+
+        kids = []
+        for ops, links in zip(canvas.pages, canvas.links):
+            stream = zlib.compress("\n".join(ops).encode("cp1252"))
+            contents = add(
+                f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode()
+                + stream
+                + b"\nendstream"
+            )
+            annots = [
+                add(
+                    (
+                        f"<< /Type /Annot /Subtype /Link /Border [0 0 0] "
+                        f"/Rect [{x1:.2f} {y1:.2f} {x2:.2f} {y2:.2f}] "
+                        f"/A << /S /URI /URI {_pdf_string(url)} >> >>"
+                    ).encode("cp1252")
+                )
+                for x1, y1, x2, y2, url in links
+            ]
+            annots_entry = (
+                f" /Annots [{' '.join(f'{ref} 0 R' for ref in annots)}]"
+                if annots
+                else ""
+            )
+            kids.append(
+                add(
+                    (
+                        f"<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                        f"/Resources << /Font << {font_refs} >> >> /Contents {contents} 0 R{annots_entry} >>"
+                    ).encode()
+                )
+            )
+
+        objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages} 0 R >>".encode()
+        objects[pages - 1] = (
+            f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>"
+        ).encode()
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+        xref_offset = len(out)
+        out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        for offset in offsets:
+            out += f"{offset:010d} 00000 n \n".encode()
+        out += (
+            f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R /Info {info} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode()
+        return bytes(out)
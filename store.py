@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Output Store - Content-addressed storage for rendered resumes
+Usage: python store.py verify store_dir
+       python store.py gc store_dir
+
+Each distinct output is stored once under objects/<2 hex>/<sha256>, and the
+requested output paths are hardlinks (or symlinks) to it, so identical
+resumes cost one file on disk and no write I/O after the first. refs.jsonl
+records which output path was linked to which object, for garbage collection.
+Hardlinks need the store and the outputs on the same filesystem.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+OBJECTS_DIR = "objects"
+TMP_DIR = "tmp"
+REFS_FILE = "refs.jsonl"
+
+LINK_MODES = ("hardlink", "symlink")
+
+
+class OutputStore:
+    def __init__(self, root, link_mode: str = "hardlink"):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode '{link_mode}'")
+        self.root = Path(root)
+        self.link_mode = link_mode
+        (self.root / OBJECTS_DIR).mkdir(parents=True, exist_ok=True)
+        (self.root / TMP_DIR).mkdir(exist_ok=True)
+        # Writes come from several I/O threads in batch runs
+        self._lock = threading.Lock()
+        self._refs = open(self.root / REFS_FILE, "a", encoding="utf-8")
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / OBJECTS_DIR / digest[:2] / digest
+
+    def put(self, data: bytes) -> Tuple[str, bool]:
+        """Stores data unless already present; returns (digest, deduplicated)."""
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self.object_path(digest)
+        if object_path.exists():
+            return digest, True
+        object_path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root / TMP_DIR)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Readable like a normal output, but read-only: every link shares it
+            os.chmod(tmp_path, 0o444)
+            # link() never replaces, so concurrent writers of the same
+            # content cannot clobber an object another output links to
+            os.link(tmp_path, object_path)
+        except FileExistsError:
+            return digest, True
+        finally:
+            os.unlink(tmp_path)
+        return digest, False
+
+    def materialize(self, digest: str, output_path):
+        """Atomically points output_path at the stored object."""
+        output_path = Path(output_path)
+        object_path = self.object_path(digest)
+        tmp_path = output_path.with_name(
+            f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        if self.link_mode == "hardlink":
+            os.link(object_path, tmp_path)
+        else:
+            os.symlink(object_path.resolve(), tmp_path)
+        os.replace(tmp_path, output_path)
+
+    def write(self, output_path, output: Union[str, bytes]) -> Tuple[int, bool]:
+        """
+        Stand-in for main.write_output: stores output and links output_path
+        to it. Returns (output size in bytes, whether it was deduplicated).
+        """
+        data = output if isinstance(output, bytes) else output.encode("utf-8")
+        digest, deduplicated = self.put(data)
+        self.materialize(digest, output_path)
+        # abspath, not resolve(): resolving would follow a symlinked output
+        # to the object itself
+        entry = {"output": os.path.abspath(output_path), "sha256": digest}
+        with self._lock:
+            self._refs.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._refs.flush()
+        return len(data), deduplicated
+
+    def objects(self) -> List[Path]:
+        return sorted((self.root / OBJECTS_DIR).glob("??/*"))
+
+    def verify(self) -> List[Path]:
+        """Rehashes every object; returns those whose content no longer matches."""
+        corrupt = []
+        for object_path in self.objects():
+            digest = hashlib.sha256()
+            with open(object_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            if digest.hexdigest() != object_path.name:
+                corrupt.append(object_path)
+        return corrupt
+
+    def _live_refs(self) -> Dict[str, str]:
+        """refs.jsonl entries whose output path still points at their object."""
+        refs = {}
+        with open(self.root / REFS_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                refs[entry["output"]] = entry["sha256"]
+        live = {}
+        for output, digest in refs.items():
+            try:
+                if os.path.samefile(output, self.object_path(digest)):
+                    live[output] = digest
+            except OSError:
+                pass
+        return live
+
+    def gc(self) -> Tuple[int, int]:
+        """
+        Deletes objects no output links to any more and drops stale refs.
+        Returns (objects removed, bytes freed). Must not run during a render
+        into the same store.
+        """
+        with self._lock:
+            live = self._live_refs()
+            live_digests = set(live.values())
+            removed = freed = 0
+            for object_path in self.objects():
+                stat = object_path.stat()
+                # A hardlinked output counts even if refs.jsonl lost track of it
+                if object_path.name in live_digests or stat.st_nlink > 1:
+                    continue
+                object_path.unlink()
+                removed += 1
+                freed += stat.st_size
+            for tmp_path in (self.root / TMP_DIR).iterdir():
+                tmp_path.unlink()
+
+            refs_path = self.root / REFS_FILE
+            self._refs.close()
+            with open(refs_path.with_suffix(".tmp"), "w", encoding="utf-8") as f:
+                for output, digest in live.items():
+                    entry = {"output": output, "sha256": digest}
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(refs_path.with_suffix(".tmp"), refs_path)
+            self._refs = open(refs_path, "a", encoding="utf-8")
+        return removed, freed
+
+    def close(self):
+        self._refs.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check or clean up a content-addressed output store"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    verify_parser = subparsers.add_parser(
+        "verify", help="Rehash every object and report corrupt ones"
+    )
+    verify_parser.add_argument("store_dir", help="Store directory")
+    gc_parser = subparsers.add_parser(
+        "gc", help="Delete objects that no output links to"
+    )
+    gc_parser.add_argument("store_dir", help="Store directory")
+    args = parser.parse_args()
+
+    if not Path(args.store_dir, OBJECTS_DIR).is_dir():
+        print(f"Error: '{args.store_dir}' is not an output store")
+        sys.exit(1)
+    try:
+        with OutputStore(args.store_dir) as store:
+            if args.command == "verify":
+                corrupt = store.verify()
+                for object_path in corrupt:
+                    print(f"Corrupt object: {object_path}")
+                print(f"Checked {len(store.objects())} objects, {len(corrupt)} corrupt")
+                if corrupt:
+                    sys.exit(1)
+            else:
+                removed, freed = store.gc()
+                print(f"Removed {removed} objects ({freed:,} bytes)")
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import async_render
+from async_render import render_async, render_file_async, render_many
+from main import HTMLGenerator, ResumeParser
+
+
+def resume(number):
+    return f"# Person {number}\n**Engineer**\n\n## Summary\nResume _{number}_."
+
+
+def expected_html(markdown):
+    parsed_data = ResumeParser().parse_markdown(markdown)
+    return HTMLGenerator(css_file_path=os.devnull).generate_html(parsed_data)
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestAsyncRender(unittest.TestCase):
+    def test_render_async_matches_sync(self):
+        html = asyncio.run(render_async(resume(1), os.devnull))
+        self.assertEqual(html, expected_html(resume(1)))
+
+    def test_render_file_async(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = Path(tmp) / "cv.md"
+            input_path.write_text(resume(2), encoding="utf-8")
+            output_path = asyncio.run(render_file_async(input_path, None, os.devnull))
+            self.assertEqual(output_path, Path(tmp) / "cv.html")
+            self.assertEqual(
+                output_path.read_text(encoding="utf-8"), expected_html(resume(2))
+            )
+
+    def test_render_many_ordered_from_async_iterable(self):
+        async def documents():
+            for number in range(20):
+                yield resume(number)
+
+        results = asyncio.run(
+            collect(render_many(documents(), concurrency=3, css_file_path=os.devnull))
+        )
+        self.assertEqual([index for index, _ in results], list(range(20)))
+        self.assertEqual(results[7][1], expected_html(resume(7)))
+
+    def test_render_many_as_completed(self):
+        documents = [resume(number) for number in range(10)]
+        results = asyncio.run(
+            collect(
+                render_many(
+                    documents, concurrency=4, ordered=False, css_file_path=os.devnull
+                )
+            )
+        )
+        self.assertEqual(sorted(index for index, _ in results), list(range(10)))
+        for index, html in results:
+            self.assertEqual(html, expected_html(documents[index]))
+
+    def test_render_many_bounds_documents_in_flight(self):
+        in_flight = 0
+        peak = 0
+        real_render = async_render.render_async
+
+        async def tracking_render(*args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            try:
+                return await real_render(*args)
+            finally:
+                in_flight -= 1
+
+        with mock.patch.object(async_render, "render_async", tracking_render):
+            results = asyncio.run(
+                collect(
+                    render_many(
+                        (resume(n) for n in range(30)),
+                        concurrency=5,
+                        css_file_path=os.devnull,
+                    )
+                )
+            )
+        self.assertEqual(len(results), 30)
+        self.assertLessEqual(peak, 5)
+
+    def test_render_many_errors(self):
+        documents = [resume(0), None, resume(2)]
+        with self.assertRaises(AttributeError):
+            asyncio.run(collect(render_many(documents, css_file_path=os.devnull)))
+
+        results = asyncio.run(
+            collect(
+                render_many(documents, css_file_path=os.devnull, return_exceptions=True)
+            )
+        )
+        self.assertIsInstance(results[1][1], AttributeError)
+        self.assertEqual(results[2][1], expected_html(resume(2)))
+
+    def test_render_many_with_process_pool(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = asyncio.run(
+                collect(
+                    render_many(
+                        [resume(n) for n in range(4)],
+                        css_file_path=os.devnull,
+                        executor=executor,
+                    )
+                )
+            )
+        self.assertEqual(results[3], (3, expected_html(resume(3))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import signal
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import batch
+from batch import Journal, options_fingerprint, render_batch
+from store import OutputStore
+
+
+def render_or_crash(markdown, *args):
+    """Stands in for batch._render_one; module level so workers can import it."""
+    if "CRASH" in markdown:
+        os._exit(1)
+    return batch._render_one(markdown, *args)
+
+
+class TestRenderBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.out_dir = self.root / "out"
+        self.inputs = []
+        for name in ("alice", "bob"):
+            path = self.root / f"{name}.md"
+            path.write_text(
+                f"# {name}\n**Engineer**\n\n## Summary\nHi.", encoding="utf-8"
+            )
+            self.inputs.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_renders_each_input_and_reports_failures(self):
+        missing = self.root / "missing.md"
+        results = {
+            path: error
+            for path, error, _ in render_batch(
+                self.inputs + [missing], self.out_dir, output_format="pdf", jobs=2
+            )
+        }
+        self.assertIsNone(results[self.inputs[0]])
+        self.assertIsNone(results[self.inputs[1]])
+        self.assertIn("No such file", results[missing])
+        self.assertEqual(
+            sorted(path.name for path in self.out_dir.iterdir()),
+            ["alice.pdf", "bob.pdf"],
+        )
+        self.assertTrue((self.out_dir / "alice.pdf").read_bytes().startswith(b"%PDF"))
+
+    def test_duplicate_output_names_fail_instead_of_overwriting(self):
+        other = self.root / "other" / "alice.md"
+        other.parent.mkdir()
+        other.write_text("# Other Alice", encoding="utf-8")
+        results = {
+            path: error
+            for path, error, _ in render_batch(
+                self.inputs + [other], self.out_dir, jobs=1
+            )
+        }
+        self.assertIsNone(results[self.inputs[0]])
+        self.assertIn("already taken", results[other])
+        self.assertNotIn("Other Alice", (self.out_dir / "alice.html").read_text())
+
+    def test_journal_resumes_where_it_stopped(self):
+        journal_path = self.root / "job.jsonl"
+        missing = self.root / "missing.md"
+        with Journal(journal_path) as journal:
+            render_batch(self.inputs + [missing], self.out_dir, jobs=2, journal=journal)
+        # A torn line left by a crash must not break the restart
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('{"input": "half')
+
+        self.inputs[1].write_text("# bob\n**Changed**", encoding="utf-8")
+        missing.write_text("# late\n**Arrival**", encoding="utf-8")
+        with Journal(journal_path) as journal:
+            results = render_batch(
+                self.inputs + [missing], self.out_dir, jobs=2, journal=journal
+            )
+        skipped = {path.name: was_skipped for path, _, was_skipped in results}
+        self.assertEqual(
+            skipped, {"alice.md": True, "bob.md": False, "missing.md": False}
+        )
+        self.assertIn("Changed", (self.out_dir / "bob.html").read_text())
+
+        (self.out_dir / "alice.html").unlink()
+        with Journal(journal_path) as journal:
+            results = render_batch(self.inputs, self.out_dir, jobs=1, journal=journal)
+        self.assertEqual(
+            sorted(was_skipped for _, _, was_skipped in results), [False, True]
+        )
+
+    def test_journal_rerenders_when_options_change(self):
+        journal_path = self.root / "job.jsonl"
+        style = self.root / "custom.css"
+        style.write_text("body { color: red; }", encoding="utf-8")
+
+        def skipped(**options):
+            with Journal(journal_path) as journal:
+                results = render_batch(
+                    self.inputs[:1], self.out_dir, jobs=1, journal=journal, **options
+                )
+            return results[0][2]
+
+        self.assertFalse(skipped())
+        self.assertTrue(skipped())
+        self.assertFalse(skipped(style=str(style)))
+        self.assertTrue(skipped(style=str(style)))
+        style.write_text("body { color: blue; }", encoding="utf-8")
+        self.assertFalse(skipped(style=str(style)))
+        self.assertIn("blue", (self.out_dir / "alice.html").read_text())
+        with OutputStore(self.root / "store") as store:
+            self.assertFalse(skipped(style=str(style), store=store))
+            self.assertTrue(skipped(style=str(style), store=store))
+        with OutputStore(self.root / "store", "symlink") as store:
+            self.assertFalse(skipped(style=str(style), store=store))
+
+    def test_journal_entries(self):
+        journal_path = self.root / "job.jsonl"
+        with Journal(journal_path) as journal:
+            render_batch(self.inputs[:1], self.out_dir, jobs=1, journal=journal)
+        (entry,) = [json.loads(line) for line in journal_path.read_text().splitlines()]
+        self.assertEqual(entry["status"], "ok")
+        self.assertEqual(entry["input"], str(self.inputs[0]))
+        self.assertEqual(
+            entry["sha256"], hashlib.sha256(self.inputs[0].read_bytes()).hexdigest()
+        )
+        self.assertEqual(entry["options"], options_fingerprint("style.css", "html"))
+
+    def test_fsync_batches_journal_only_synced_outputs(self):
+        journal_path = self.root / "job.jsonl"
+        with mock.patch.object(
+            batch, "_sync_outputs", wraps=batch._sync_outputs
+        ) as sync_outputs, Journal(journal_path) as journal:
+            results = render_batch(
+                self.inputs, self.out_dir, jobs=1, journal=journal, fsync_batch=2
+            )
+        sync_outputs.assert_called_once()
+        self.assertEqual(
+            sorted(sync_outputs.call_args[0][0]),
+            [self.out_dir / "alice.html", self.out_dir / "bob.html"],
+        )
+        self.assertEqual([error for _, error, _ in results], [None, None])
+        self.assertEqual(len(journal_path.read_text().splitlines()), 2)
+
+    def test_prefetch_bounds_files_in_flight(self):
+        inputs = []
+        for number in range(8):
+            path = self.root / f"resume{number}.md"
+            path.write_text(f"# Resume {number}", encoding="utf-8")
+            inputs.append(path)
+        journal_path = self.root / "job.jsonl"
+
+        def lazy_inputs():
+            for number, path in enumerate(inputs):
+                finished = len(journal_path.read_text().splitlines())
+                self.assertGreaterEqual(finished, number - 2)
+                yield path
+
+        with Journal(journal_path) as journal:
+            results = render_batch(
+                lazy_inputs(), self.out_dir, jobs=1, journal=journal, prefetch=2
+            )
+        self.assertEqual(len(results), 8)
+
+    def test_crashing_worker_fails_only_its_file(self):
+        inputs = []
+        for number in range(12):
+            path = self.root / f"resume{number}.md"
+            path.write_text("# CRASH" if number == 2 else "# Fine", encoding="utf-8")
+            inputs.append(path)
+        journal_path = self.root / "job.jsonl"
+        # Workers don't fork from this process, so they only see the patch
+        # through the function the batch submits to them
+        with mock.patch.object(batch, "_render_one", render_or_crash), Journal(
+            journal_path
+        ) as journal:
+            results = render_batch(inputs, self.out_dir, jobs=2, journal=journal)
+        errors = {path.name: error for path, error, _ in results}
+        self.assertIn("worker process died", errors.pop("resume2.md"))
+        self.assertEqual(errors, {path.name: None for path in inputs[:2] + inputs[3:]})
+        entries = [json.loads(line) for line in journal_path.read_text().splitlines()]
+        failed = [entry["input"] for entry in entries if entry["status"] == "failed"]
+        self.assertEqual(failed, [str(inputs[2])])
+
+    @unittest.skipUnless(hasattr(signal, "setitimer"), "needs POSIX timers")
+    def test_timeout_fails_only_the_slow_file(self):
+        def slow_render(*args):
+            time.sleep(5)
+
+        with mock.patch.object(batch, "render_markdown", slow_render):
+            result = batch._render_one("# alice", "style.css", "html", 0.1)
+        self.assertEqual(result["error"], "Timed out after 0.1s")
+
+
+if __name__ == "__main__":
+    unittest.main()
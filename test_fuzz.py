@@ -0,0 +1,43 @@
+import unittest
+
+import fuzz
+import main
+
+
+class BrokenItalicGenerator(main.HTMLGenerator):
+    """Drops the snake_case quirk so the fuzzer has something to find."""
+
+    def process_italic(self, text: str) -> str:
+        return text
+
+
+class TestFuzz(unittest.TestCase):
+    def test_grammar_is_deterministic(self):
+        self.assertEqual(
+            fuzz.ResumeGrammar(42).resume(), fuzz.ResumeGrammar(42).resume()
+        )
+        self.assertNotEqual(
+            fuzz.ResumeGrammar(1).resume(), fuzz.ResumeGrammar(2).resume()
+        )
+
+    def test_main_matches_reference(self):
+        self.assertIsNone(fuzz.fuzz(seed=0, iterations=300))
+
+    def test_divergence_is_found_and_minimized(self):
+        broken = (main.ResumeParser, BrokenItalicGenerator)
+        failure = fuzz.fuzz(seed=0, iterations=50, candidate=broken)
+        self.assertIsNotNone(failure)
+        failing_seed, minimized = failure
+        original = fuzz.ResumeGrammar(failing_seed).resume()
+        self.assertLess(len(minimized), len(original))
+        self.assertIn("_", minimized)
+        self.assertTrue(fuzz.diverges(minimized, broken, fuzz.ENGINES["reference"]))
+
+    def test_minimize_keeps_single_culprit_line(self):
+        markdown = "# Name\n## A\nfine\n## B\nbad line here\nmore"
+        minimized = fuzz.minimize(markdown, lambda md: "bad" in md)
+        self.assertEqual(minimized, "bad")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import index
+from index import CorpusIndex, extract_terms, normalize
+from main import ResumeParser
+
+GO_RESUME = """# Jane Doe
+**Platform Engineer**
+
+## Skills
+**Infrastructure:** Kubernetes, _Terraform_; Go (Expert)
+
+## Experience
+### Google | Tech Lead
+_2020 - Present_
+- Ran clusters.
+
+## Education
+**B.S. Computer Science** - Some University
+"""
+
+PYTHON_RESUME = """# John Doe
+**Data Engineer**
+
+## Skills
+**Languages:** Python, SQL
+
+## Experience
+### Acme Corp | Engineer
+_2018 - 2020_
+- Built pipelines.
+"""
+
+
+class TestCorpusIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.corpus = Path(self.tmp.name) / "corpus"
+        self.corpus.mkdir()
+        (self.corpus / "jane.md").write_text(GO_RESUME, encoding="utf-8")
+        (self.corpus / "john.md").write_text(PYTHON_RESUME, encoding="utf-8")
+        self.index = CorpusIndex(Path(self.tmp.name) / "index")
+        self.index.build(self.corpus)
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def names(self, expression):
+        return [Path(path).name for path in self.index.query(expression)]
+
+    def test_normalize(self):
+        self.assertEqual(normalize(" **Go** (Expert) "), "go")
+        self.assertEqual(normalize("[Kubernetes](https://k8s.io)"), "kubernetes")
+
+    def test_extract_terms(self):
+        terms = extract_terms(ResumeParser().parse_markdown(GO_RESUME))
+        self.assertIn("skill:kubernetes", terms)
+        self.assertIn("skill:terraform", terms)
+        self.assertIn("skill:go", terms)
+        self.assertIn("category:infrastructure", terms)
+        self.assertIn("company:google", terms)
+        self.assertIn("role:tech lead", terms)
+        self.assertIn("term:b.s. computer science", terms)
+
+    def test_boolean_queries(self):
+        self.assertEqual(self.names("Kubernetes"), ["jane.md"])
+        self.assertEqual(self.names("kubernetes OR python"), ["jane.md", "john.md"])
+        self.assertEqual(self.names("kubernetes python"), [])
+        self.assertEqual(self.names("NOT kubernetes"), ["john.md"])
+        self.assertEqual(self.names('role:"tech lead" AND (go OR sql)'), ["jane.md"])
+        self.assertEqual(self.names("company:kubernetes"), [])
+        self.assertEqual(self.names("rust"), [])
+
+    def test_malformed_query(self):
+        with self.assertRaises(ValueError):
+            self.index.query("(go AND")
+
+    def test_incremental_update(self):
+        (self.corpus / "john.md").write_text(
+            PYTHON_RESUME.replace("Python", "Kubernetes") + "\n", encoding="utf-8"
+        )
+        (self.corpus / "jane.md").unlink()
+        (self.corpus / "new.md").write_text(GO_RESUME, encoding="utf-8")
+        stats = self.index.build(self.corpus)
+        self.assertEqual(stats, {"parsed": 2, "reused": 0, "removed": 1, "failed": 0})
+        self.assertEqual(self.names("kubernetes"), ["john.md", "new.md"])
+
+        stats = self.index.build(self.corpus)
+        self.assertEqual(stats, {"parsed": 0, "reused": 2, "removed": 0, "failed": 0})
+
+    def test_unreadable_files_are_reported_and_skipped(self):
+        (self.corpus / "latin1.md").write_bytes("# Ren\xe9e\n".encode("latin-1"))
+        (self.corpus / "dangling.md").symlink_to(self.corpus / "missing.md")
+        (self.corpus / "new.md").write_text(GO_RESUME, encoding="utf-8")
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            stats = self.index.build(self.corpus)
+        self.assertEqual(stats, {"parsed": 1, "reused": 2, "removed": 0, "failed": 2})
+        self.assertIn("latin1.md", stderr.getvalue())
+        self.assertIn("dangling.md", stderr.getvalue())
+        self.assertEqual(self.names("go"), ["jane.md", "new.md"])
+
+    def test_queries_do_not_read_the_manifest(self):
+        self.index.close()
+        (self.index._generation() / index.MANIFEST_FILE).unlink()
+        self.assertEqual(self.names("go"), ["jane.md"])
+
+    def test_crashed_build_leaves_previous_index_intact(self):
+        (self.corpus / "john.md").write_text(
+            PYTHON_RESUME.replace("Python", "Go"), encoding="utf-8"
+        )
+        real_write_json = CorpusIndex._write_json
+
+        def crash_on_manifest(path, data):
+            if path.name == index.MANIFEST_FILE:
+                raise OSError("disk full")
+            real_write_json(path, data)
+
+        with mock.patch.object(
+            CorpusIndex, "_write_json", staticmethod(crash_on_manifest)
+        ):
+            with self.assertRaises(OSError):
+                self.index.build(self.corpus)
+        self.assertEqual(self.names("go"), ["jane.md"])
+
+        self.index.build(self.corpus)
+        self.assertEqual(self.names("go"), ["jane.md", "john.md"])
+        generations = sorted(
+            path.name
+            for path in self.index.index_dir.glob(index.GENERATION_PREFIX + "*")
+        )
+        self.assertEqual(generations, ["gen-1", "gen-3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import main
+from large import LargeDocumentWriter, count_entries
+from main import HTMLGenerator, ResumeParser
+
+
+def resume_with_publications(count):
+    publications = "\n".join(f"- Paper _{i}_ on **parsing**" for i in range(count))
+    return f"""# Jane Doe
+**Researcher**
+
+## Summary
+Writes papers.
+
+## Publications
+{publications}
+
+## Skills
+**Languages:** Python, Go
+"""
+
+
+class TestLargeDocumentWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_path = Path(self.tmp.name) / "cv.html"
+        self.generator = HTMLGenerator()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_count_entries(self):
+        parsed_data = ResumeParser().parse_markdown(resume_with_publications(30))
+        counts = [count_entries(section) for section in parsed_data["sections"]]
+        self.assertEqual(counts, [0, 30, 1])
+
+    def test_count_entries_ignores_blank_pieces(self):
+        timeline = {
+            "title": "Experience",
+            "type": "timeline",
+            "content": "### A | Dev\n_2020_\n### B | Dev\n_2021_\n### C | Dev\n_2022_",
+        }
+        bullets = {
+            "title": "Publications",
+            "type": "bullet_list",
+            "content": "\n\n".join(f"- Paper {i}" for i in range(6)),
+        }
+        self.assertEqual(count_entries(timeline), 3)
+        self.assertEqual(count_entries(bullets), 6)
+
+        parsed_data = {"header": {"name": "Jane"}, "sections": [timeline, bullets]}
+        written = LargeDocumentWriter(
+            self.generator, threshold=2, split_pages=True, page_size=2
+        ).write(parsed_data, self.output_path)
+        pages = [path.read_text(encoding="utf-8") for path in written[1:]]
+        self.assertEqual(
+            [page.count('<div class="list-item-container-flex"') for page in pages[:2]],
+            [2, 1],
+        )
+        self.assertEqual([page.count("<li>") for page in pages[2:]], [2, 2, 2])
+        html = self.output_path.read_text(encoding="utf-8")
+        self.assertIn("(3 entries)", html)
+        self.assertIn("6 entries on 3 pages", html)
+
+    def test_small_documents_match_generate_html(self):
+        parsed_data = ResumeParser().parse_markdown(resume_with_publications(10))
+        LargeDocumentWriter(self.generator, threshold=100).write(
+            parsed_data, self.output_path
+        )
+        self.assertEqual(
+            self.output_path.read_text(encoding="utf-8"),
+            self.generator.generate_html(parsed_data),
+        )
+
+    def test_streamed_section_matches_regular_rendering(self):
+        parsed_data = ResumeParser().parse_markdown(resume_with_publications(1000))
+        LargeDocumentWriter(self.generator, threshold=100, chunk_size=7).write(
+            parsed_data, self.output_path
+        )
+        html = self.output_path.read_text(encoding="utf-8")
+        publications = parsed_data["sections"][1]
+        self.assertIn(self.generator.generate_section(publications), html)
+        self.assertIn('<nav class="toc"><h2>Contents</h2>', html)
+        self.assertIn(
+            '<li><a href="#section-2">Publications</a> (1,000 entries)</li>', html
+        )
+        self.assertIn('<a id="section-2"></a><h2>Publications</h2>', html)
+
+    def test_split_pages(self):
+        parsed_data = ResumeParser().parse_markdown(resume_with_publications(250))
+        written = LargeDocumentWriter(
+            self.generator, threshold=100, split_pages=True, page_size=100
+        ).write(parsed_data, self.output_path)
+        self.assertEqual(
+            [path.name for path in written],
+            [
+                "cv.html",
+                "cv-2-publications-1.html",
+                "cv-2-publications-2.html",
+                "cv-2-publications-3.html",
+            ],
+        )
+        html = self.output_path.read_text(encoding="utf-8")
+        self.assertNotIn("<li>Paper", html)
+        self.assertIn("250 entries on 3 pages", html)
+        self.assertIn('<a href="cv-2-publications-1.html">Publications</a>', html)
+        self.assertIn("<h2>Skills</h2>", html)
+
+        pages = [path.read_text(encoding="utf-8") for path in written[1:]]
+        self.assertEqual([page.count("<li>") for page in pages], [100, 100, 50])
+        self.assertIn("<h2>Publications (2/3)</h2>", pages[1])
+        self.assertIn(
+            "<li>Paper <em>100</em> on <strong>parsing</strong></li>", pages[1]
+        )
+        self.assertIn('<a href="cv-2-publications-3.html">Next</a>', pages[1])
+        self.assertIn('<a href="cv.html#section-2">Back to resume</a>', pages[2])
+        self.assertNotIn(">Next</a>", pages[2])
+
+    def test_page_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            LargeDocumentWriter(self.generator, split_pages=True, page_size=0)
+
+    def test_cli_rejects_options_it_would_ignore(self):
+        input_path = Path(self.tmp.name) / "cv.md"
+        input_path.write_text(resume_with_publications(30), encoding="utf-8")
+        for options, error in [
+            (["-f", "pdf", "--large-sections", "10"], "only apply to HTML"),
+            (["-f", "pdf", "--split-pages"], "only apply to HTML"),
+            (["--large-sections", "-1"], "cannot be negative"),
+            (["--split-pages"], "requires --large-sections"),
+            (["--large-sections", "10", "--page-size", "5"], "requires --split-pages"),
+            (
+                ["--large-sections", "10", "--split-pages", "--page-size", "0"],
+                "at least 1",
+            ),
+            (
+                ["--large-sections", "10", "--split-pages", "--page-size", "-6"],
+                "at least 1",
+            ),
+        ]:
+            argv = ["main.py", str(input_path), str(self.output_path)] + options
+            with mock.patch("sys.argv", argv), mock.patch(
+                "sys.stdout", new_callable=io.StringIO
+            ) as stdout:
+                with self.assertRaises(SystemExit):
+                    main.main()
+            self.assertIn(error, stdout.getvalue())
+            self.assertFalse(self.output_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
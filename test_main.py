@@ -1,6 +1,6 @@
 import unittest
 
-from main import HTMLGenerator, ResumeParser
+from main import SECTION_TYPES, HTMLGenerator, ResumeParser, SectionType
 
 
 class TestResumeParser(unittest.TestCase):
@@ -262,6 +262,33 @@ class TestHTMLGenerator(unittest.TestCase):
         expected4 = 'Please see: <a href="http://example.com/details_a"><strong>Detail <em>A</em></strong></a> and also <a href="http://example.com/details_b">Detail B</a>.'
         self.assertEqual(self.generator.process_text(text4), expected4)
 
+    def test_process_text_escapes_html(self):
+        text = "R&D <script> **\"Bold\"** [it's](https://example.com/?a=1&b=\"2\")"
+        expected = (
+            "R&amp;D &lt;script&gt; <strong>&quot;Bold&quot;</strong> "
+            '<a href="https://example.com/?a=1&amp;b=&quot;2&quot;">it&#x27;s</a>'
+        )
+        self.assertEqual(self.generator.process_text(text), expected)
+
+    def test_script_urls_are_neutralized(self):
+        for url in ["javascript:alert`1`", " JavaScript:x", "java\tscript:x", "data:,x"]:
+            self.assertEqual(
+                self.generator.process_text(f"[x]({url})"), '<a href="#">x</a>'
+            )
+
+    def test_titles_are_escaped(self):
+        html = self.generator.generate_html(
+            {
+                "header": {"name": "Tom & <Jerry>"},
+                "sections": [
+                    {"title": "R&D", "type": "paragraph", "content": "Text"}
+                ],
+            }
+        )
+        self.assertIn("<title>Tom &amp; &lt;Jerry&gt;</title>", html)
+        self.assertIn("<h1>Tom &amp; &lt;Jerry&gt;</h1>", html)
+        self.assertIn("<h2>R&amp;D</h2>", html)
+
     def test_process_bold(self):
         text = "**Bold Text**"
         expected = "<strong>Bold Text</strong>"
@@ -473,5 +500,72 @@ Not a description list item.
         self.assertIn('<div class="no-print"><strong>📄 To save as PDF:</strong>', html)
 
 
+class TestSectionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = SECTION_TYPES.copy()
+        self.registry.register(
+            SectionType(
+                "publications",
+                detector=lambda lines: all(line.startswith("1. ") for line in lines),
+                parser=lambda content: [
+                    {"citation": line.strip()[3:]}
+                    for line in content.split("\n")
+                    if line.strip()
+                ],
+                template='<div class="publication">{citation}</div>',
+            ),
+            before="bullet_list",
+        )
+
+    def test_custom_type_is_detected_and_rendered(self):
+        markdown_content = """# Jane Doe
+**Researcher**
+
+## Publications
+1. _Fast Parsing_, 2021
+1. **Faster** Parsing, 2023
+"""
+        parsed_data = ResumeParser(registry=self.registry).parse_markdown(
+            markdown_content
+        )
+        self.assertEqual(parsed_data["sections"][0]["type"], "publications")
+
+        html = HTMLGenerator(registry=self.registry).generate_html(parsed_data)
+        self.assertIn("<h2>Publications</h2>", html)
+        self.assertIn('<div class="publication"><em>Fast Parsing</em>, 2021</div>', html)
+        self.assertIn(
+            '<div class="publication"><strong>Faster</strong> Parsing, 2023</div>', html
+        )
+
+    def test_custom_type_does_not_leak_into_shared_registry(self):
+        self.assertIn("publications", self.registry)
+        self.assertNotIn("publications", SECTION_TYPES)
+        self.assertEqual(
+            ResumeParser()._determine_section_type(["1. Paper"]), "paragraph"
+        )
+
+    def test_registration_order_decides_detection(self):
+        self.registry.register(
+            SectionType(
+                "numbered",
+                detector=lambda lines: lines[0].startswith("1."),
+                renderer="generate_generic_paragraph_section",
+            ),
+            before="publications",
+        )
+        self.assertEqual(self.registry.detect(["1. Paper"]), "numbered")
+        self.assertEqual(self.registry.detect([]), "paragraph")
+
+    def test_section_type_requires_renderer_or_template(self):
+        with self.assertRaises(ValueError):
+            SectionType("broken", detector=lambda lines: True)
+
+    def test_template_rejects_fields_format_would_treat_specially(self):
+        templates = ("{a!r:>8}", "{a:>8}", "{a!s}", "{0}", "{}", "{a.b}", "{a[0]}")
+        for template in templates:
+            with self.assertRaises(ValueError):
+                SectionType("broken", parser=lambda content: [], template=template)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,85 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from main import render_file
+from metrics import MetricsLog
+
+RESUME = """# Jane Doe
+**Engineer**
+
+## Summary
+Builds things.
+
+## Skills
+**Languages:** Python, Go
+
+## Projects
+- One
+- Two
+"""
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.input_path = self.root / "jane.md"
+        self.input_path.write_text(RESUME, encoding="utf-8")
+        self.css_path = self.root / "style.css"
+        self.css_path.write_text("body {}", encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_render_file_metrics(self):
+        output_path = self.root / "jane.html"
+        metrics = render_file(self.input_path, output_path, str(self.css_path))
+        self.assertEqual(metrics["input_bytes"], len(RESUME.encode("utf-8")))
+        self.assertEqual(metrics["output_bytes"], output_path.stat().st_size)
+        self.assertEqual(
+            metrics["sections"], {"paragraph": 1, "aligned_list": 1, "bullet_list": 1}
+        )
+        self.assertEqual(metrics["warnings"], [])
+        for stage in ("parse_s", "render_s", "write_s"):
+            self.assertGreaterEqual(metrics[stage], 0)
+
+        again = render_file(self.input_path, output_path, str(self.css_path))
+        self.assertEqual((again["cache_hits"], again["cache_misses"]), (1, 0))
+
+    def test_warnings_are_recorded(self):
+        missing_css = str(self.root / "missing.css")
+        with redirect_stderr(io.StringIO()):
+            metrics = render_file(self.input_path, self.root / "out.html", missing_css)
+        self.assertEqual(len(metrics["warnings"]), 1)
+        self.assertIn("Could not read CSS file", metrics["warnings"][0])
+
+    def test_metrics_log_lines_and_summary(self):
+        log_path = self.root / "metrics.jsonl"
+        with MetricsLog(log_path) as metrics_log:
+            metrics_log.record(
+                render_file(self.input_path, self.root / "a.html", str(self.css_path))
+            )
+            metrics_log.record_failure(self.root / "missing.md", "not found")
+        with MetricsLog(log_path):
+            pass
+
+        records = [json.loads(line) for line in log_path.read_text().splitlines()]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["document", "document", "summary", "summary"],
+        )
+        self.assertIsNone(records[0]["error"])
+        self.assertEqual(records[1]["error"], "not found")
+        summary = records[2]
+        self.assertEqual((summary["documents"], summary["failed"]), (2, 1))
+        self.assertEqual(summary["input_bytes"], records[0]["input_bytes"])
+        self.assertGreater(summary["docs_per_s"], 0)
+        self.assertEqual(records[3]["documents"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
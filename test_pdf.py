@@ -0,0 +1,144 @@
+import re
+import unittest
+import zlib
+
+from main import SECTION_TYPES, ResumeParser, SectionType
+from pdf import CONTENT_WIDTH, PDFGenerator, text_width
+
+
+def page_streams(pdf_bytes):
+    return [
+        zlib.decompress(stream).decode("cp1252")
+        for stream in re.findall(rb"stream\n(.*?)\nendstream", pdf_bytes, re.S)
+    ]
+
+
+class TestPDFGenerator(unittest.TestCase):
+    def setUp(self):
+        self.generator = PDFGenerator()
+
+    def render(self, markdown_content):
+        parsed_data = ResumeParser().parse_markdown(markdown_content)
+        return self.generator.generate_pdf(parsed_data)
+
+    def test_document_structure(self):
+        pdf_bytes = self.render("# Jane Doe\n**Engineer**\n\n## Summary\nHello.")
+        self.assertTrue(pdf_bytes.startswith(b"%PDF-1.4"))
+        self.assertTrue(pdf_bytes.endswith(b"%%EOF\n"))
+        startxref = int(re.search(rb"startxref\n(\d+)", pdf_bytes).group(1))
+        self.assertEqual(pdf_bytes[startxref : startxref + 4], b"xref")
+        for number, offset in enumerate(re.findall(rb"(\d{10}) 00000 n", pdf_bytes), 1):
+            self.assertTrue(
+                pdf_bytes[int(offset) :].startswith(f"{number} 0 obj".encode())
+            )
+        self.assertIn(b"/BaseFont /Helvetica-Bold", pdf_bytes)
+        self.assertIn(b"/Title (Jane Doe)", pdf_bytes)
+
+    def test_parse_runs_follows_inline_formatting(self):
+        runs = self.generator.parse_runs(
+            "**Bold** _it_ [**Link**](http://example.com) snake_case_name"
+        )
+        self.assertEqual(
+            runs,
+            [
+                ("Bold", True, False, None),
+                (" ", False, False, None),
+                ("it", False, True, None),
+                (" ", False, False, None),
+                ("Link", True, False, "http://example.com"),
+                (" snake", False, False, None),
+                ("case", False, True, None),
+                ("name", False, False, None),
+            ],
+        )
+
+    def test_parse_runs_returns_to_the_base_style(self):
+        self.assertEqual(
+            self.generator.parse_runs("**Senior** Engineer", bold=True),
+            [("Senior", True, False, None), (" Engineer", True, False, None)],
+        )
+        self.assertEqual(
+            self.generator.parse_runs("_2019_ - Present", italic=True),
+            [("2019", False, True, None), (" - Present", False, True, None)],
+        )
+
+    def test_parse_runs_undoes_html_escaping(self):
+        runs = self.generator.parse_runs("R&D <b> [x](https://example.com/?a=1&b=2)")
+        self.assertEqual(
+            runs,
+            [
+                ("R&D <b> ", False, False, None),
+                ("x", False, False, "https://example.com/?a=1&b=2"),
+            ],
+        )
+
+    def test_text_is_drawn_with_styles_and_links(self):
+        pdf_bytes = self.render(
+            "# Jane Doe\n**Engineer**\n\n## Skills\n"
+            "**Languages:** Python, [Go](https://go.dev) (Expert)"
+        )
+        (stream,) = page_streams(pdf_bytes)
+        self.assertIn("/F2 13 Tf", stream)
+        self.assertIn("(Languages:) Tj", stream)
+        self.assertIn("(Go) Tj", stream)
+        self.assertIn("(\\(Expert\\)) Tj", stream)
+        self.assertIn(b"/URI (https://go.dev)", pdf_bytes)
+
+    def test_wrap_respects_width(self):
+        runs = self.generator.parse_runs("word " * 200)
+        lines = self.generator._wrap(runs, CONTENT_WIDTH, 10)
+        self.assertGreater(len(lines), 1)
+        for line in lines:
+            x, text, bold = line[-1][:3]
+            self.assertLessEqual(x + text_width(text, bold, 10), CONTENT_WIDTH)
+
+    def test_timeline_header_wraps_short_of_the_date(self):
+        role = (
+            "Principal Engineer, Distributed Storage, Data and Machine Learning "
+            "Platforms"
+        )
+        pdf_bytes = self.render(
+            f"# Jane\n\n## Experience\n### Example Corporation | {role}\n"
+            "_January 2019 - Present_"
+        )
+        (stream,) = page_streams(pdf_bytes)
+        items = re.findall(
+            r"BT /(F\d) (\S+) Tf (\S+) (\S+) Td \((.*?)\) Tj ET", stream
+        )
+        # Name and section heading first, then the header lines and the date
+        *header, (_, _, date_x, date_y, date) = items[2:]
+        self.assertEqual(date, "January 2019 - Present")
+        self.assertEqual(header[0][3], date_y)
+        self.assertGreater(len({item[3] for item in header}), 1)
+        for font, size, x, y, text in header:
+            right = float(x) + text_width(text, font == "F2", float(size))
+            self.assertLess(right, float(date_x))
+
+    def test_sections_are_drawn_through_the_registry(self):
+        registry = SECTION_TYPES.copy()
+        registry.register(
+            SectionType("tools", renderer="generate_generic_bullet_list_section")
+        )
+        parsed_data = {
+            "header": {"name": "Jane Doe"},
+            "sections": [{"title": "Tools", "type": "tools", "content": "- Vim"}],
+        }
+        (stream,) = page_streams(PDFGenerator(registry).generate_pdf(parsed_data))
+        self.assertIn("(\u2022) Tj", stream)
+        self.assertIn("(Vim) Tj", stream)
+
+    def test_long_sections_paginate(self):
+        bullets = "\n".join(f"- Publication number {i}" for i in range(300))
+        pdf_bytes = self.render(
+            f"# Jane Doe\n**Researcher**\n\n## Publications\n{bullets}"
+        )
+        streams = page_streams(pdf_bytes)
+        page_count = int(re.search(rb"/Count (\d+)", pdf_bytes).group(1))
+        self.assertGreater(page_count, 1)
+        self.assertEqual(len(streams), page_count)
+        self.assertIn(f"(1 / {page_count}) Tj", streams[0])
+        self.assertIn("(Publication number 299) Tj", streams[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from async_render import render_file_async
+from batch import render_batch
+from main import render_file, write_output
+from store import OutputStore
+
+RESUME = "# Jane Doe\n**Engineer**\n\n## Summary\nHi."
+
+
+class TestOutputStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.store = OutputStore(self.root / "store")
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_identical_outputs_share_one_object(self):
+        first, second = self.root / "a.html", self.root / "b.html"
+        self.assertEqual(self.store.write(first, "<p>same</p>"), (11, False))
+        self.assertEqual(self.store.write(second, "<p>same</p>"), (11, True))
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertEqual(len(self.store.objects()), 1)
+        self.assertEqual(second.read_text(), "<p>same</p>")
+
+    def test_symlink_mode(self):
+        store = OutputStore(self.root / "store", link_mode="symlink")
+        output_path = self.root / "a.pdf"
+        store.write(output_path, b"%PDF")
+        store.close()
+        self.assertTrue(output_path.is_symlink())
+        self.assertEqual(output_path.read_bytes(), b"%PDF")
+
+    def test_rewrite_replaces_the_link(self):
+        output_path = self.root / "a.html"
+        self.store.write(output_path, "old")
+        self.store.write(output_path, "new")
+        self.assertEqual(output_path.read_text(), "new")
+        self.assertEqual(len(self.store.objects()), 2)
+
+    def test_no_writer_modifies_the_store_in_place(self):
+        input_path = self.root / "jane.md"
+        input_path.write_text(RESUME, encoding="utf-8")
+        shared = self.root / "shared.html"
+        self.store.write(shared, "stored")
+        for name, render in [
+            (
+                "large.html",
+                lambda path: render_file(input_path, path, large_threshold=1),
+            ),
+            (
+                "async.html",
+                lambda path: asyncio.run(render_file_async(input_path, path)),
+            ),
+            ("plain.html", lambda path: write_output(path, "plain")),
+        ]:
+            output_path = self.root / name
+            self.store.write(output_path, "stored")
+            render(output_path)
+            self.assertNotEqual(output_path.read_text(), "stored")
+        self.assertEqual(shared.read_text(), "stored")
+        self.assertEqual(self.store.verify(), [])
+
+    def test_verify_reports_corrupt_objects(self):
+        self.store.write(self.root / "a.html", "intact")
+        self.store.write(self.root / "b.html", "damaged")
+        (damaged,) = [
+            path for path in self.store.objects() if path.read_text() == "damaged"
+        ]
+        damaged.chmod(0o644)
+        damaged.write_text("tampered")
+        self.assertEqual(self.store.verify(), [damaged])
+
+    def test_gc_removes_only_unreferenced_objects(self):
+        for name in ("a", "b", "c"):
+            self.store.write(self.root / f"{name}.html", name)
+        (self.root / "a.html").unlink()
+        self.store.write(self.root / "b.html", "b2")
+        self.assertEqual(self.store.gc(), (2, 2))
+        self.assertEqual(
+            sorted(path.read_text() for path in self.store.objects()), ["b2", "c"]
+        )
+        refs = (self.root / "store" / "refs.jsonl").read_text().splitlines()
+        self.assertEqual(len(refs), 2)
+        self.assertEqual((self.root / "c.html").read_text(), "c")
+
+    def test_gc_in_symlink_mode(self):
+        store = OutputStore(self.root / "links", link_mode="symlink")
+        for name in ("a", "b", "c"):
+            store.write(self.root / f"{name}.html", name)
+        (self.root / "a.html").unlink()
+        store.write(self.root / "b.html", "b2")
+        self.assertEqual(store.gc(), (2, 2))
+        self.assertEqual(
+            sorted(path.read_text() for path in store.objects()), ["b2", "c"]
+        )
+        self.assertEqual((self.root / "b.html").read_text(), "b2")
+        store.close()
+
+    def test_render_file_and_batch_use_the_store(self):
+        inputs = []
+        for name in ("alice", "bob"):
+            path = self.root / f"{name}.md"
+            path.write_text(RESUME, encoding="utf-8")
+            inputs.append(path)
+        metrics = render_file(inputs[0], self.root / "single.html", store=self.store)
+        self.assertFalse(metrics["deduplicated"])
+
+        results = render_batch(inputs, self.root / "out", jobs=1, store=self.store)
+        self.assertEqual([error for _, error, _ in results], [None, None])
+        self.assertEqual(len(self.store.objects()), 1)
+        self.assertTrue(
+            os.path.samefile(self.root / "single.html", self.root / "out" / "bob.html")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()